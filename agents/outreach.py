@@ -1,8 +1,14 @@
+import asyncio
+import random
 import smtplib
+import queue
+import threading
 import uuid
 import time
 import os
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -12,11 +18,181 @@ import logging
 import re
 from jinja2 import Template
 
+try:
+    import aiosmtplib
+except ImportError:
+    aiosmtplib = None
+
+# Whether send_batch_emails_async can send real emails in this environment
+ASYNC_SMTP_AVAILABLE = aiosmtplib is not None
+
 from models.outreach import (
     OutreachTemplate, CandidateEmail, EmailStatus, OutreachMetrics, 
     OutreachSummary, EmailProvider
 )
 
+@lru_cache(maxsize=128)
+def _compile_template(source: str) -> Template:
+    """Jinja template for a subject/body source, parsed once and reused for every candidate"""
+    return Template(source)
+
+class _PipeliningSMTP(smtplib.SMTP):
+    """SMTP client that sends MAIL, RCPT and DATA in one write when the server allows PIPELINING (RFC 2920)"""
+    
+    def sendmail(self, from_addr, to_addrs, msg, mail_options=(), rcpt_options=()):
+        self.ehlo_or_helo_if_needed()
+        if not self.has_extn('pipelining') or mail_options or rcpt_options:
+            return super().sendmail(from_addr, to_addrs, msg, mail_options, rcpt_options)
+        
+        if isinstance(to_addrs, str):
+            to_addrs = [to_addrs]
+        if isinstance(msg, str):
+            msg = smtplib._fix_eols(msg).encode('ascii')
+        
+        size_option = f" size={len(msg)}" if self.has_extn('size') else ""
+        commands = [f"mail FROM:{smtplib.quoteaddr(from_addr)}{size_option}"]
+        commands += [f"rcpt TO:{smtplib.quoteaddr(address)}" for address in to_addrs]
+        commands.append("data")
+        
+        # One round-trip for the envelope; replies come back in command order
+        self.send("".join(f"{command}\r\n" for command in commands))
+        replies = [self.getreply() for _ in commands]
+        
+        mail_reply, rcpt_replies, data_reply = replies[0], replies[1:-1], replies[-1]
+        refused = {
+            address: reply for address, reply in zip(to_addrs, rcpt_replies)
+            if reply[0] not in (250, 251)
+        }
+        
+        if mail_reply[0] != 250 or len(refused) == len(to_addrs) or data_reply[0] != 354:
+            if data_reply[0] == 354:
+                # Server is already waiting for the body; end it empty before resetting
+                self.send(b"." + smtplib.bCRLF)
+                self.getreply()
+            self._rset()
+            if mail_reply[0] != 250:
+                raise smtplib.SMTPSenderRefused(mail_reply[0], mail_reply[1], from_addr)
+            if len(refused) == len(to_addrs):
+                raise smtplib.SMTPRecipientsRefused(refused)
+            raise smtplib.SMTPDataError(*data_reply)
+        
+        body = smtplib._quote_periods(msg)
+        if body[-2:] != smtplib.bCRLF:
+            body += smtplib.bCRLF
+        self.send(body + b"." + smtplib.bCRLF)
+        code, response = self.getreply()
+        if code != 250:
+            self._rset()
+            raise smtplib.SMTPDataError(code, response)
+        return refused
+
+class _SMTPSession:
+    """Authenticated SMTP connection reused for every email of a batch"""
+    
+    def __init__(self, provider: EmailProvider):
+        self.provider = provider
+        
+        # Parse server and port
+        server_parts = provider.api_endpoint.split(':')
+        self.smtp_server = server_parts[0]
+        self.smtp_port = int(server_parts[1]) if len(server_parts) > 1 else 587
+        self.server = None
+    
+    def __enter__(self) -> "_SMTPSession":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def connect(self):
+        """Open the connection and run STARTTLS and AUTH once for the whole session"""
+        self.close()
+        
+        print(f"   📨 Connecting to {self.smtp_server}:{self.smtp_port}")
+        server = _PipeliningSMTP(self.smtp_server, self.smtp_port)
+        try:
+            server.set_debuglevel(0)  # Set to 1 for debug output
+            server.starttls()
+            
+            print(f"   🔐 Authenticating as {self.provider.sender_email}")
+            server.login(self.provider.sender_email, self.provider.api_key)
+        except Exception:
+            server.close()
+            raise
+        self.server = server
+    
+    def sendmail(self, to_address: str, message: str):
+        """Send on the live connection, reconnecting once if the server dropped it"""
+        if self.server is None:
+            self.connect()
+        
+        try:
+            self.server.sendmail(self.provider.sender_email, to_address, message)
+        except smtplib.SMTPServerDisconnected:
+            # Idle connections get closed server-side (e.g. during a stagger wait)
+            print(f"   🔄 SMTP connection closed by server, reconnecting...")
+            self.connect()
+            self.server.sendmail(self.provider.sender_email, to_address, message)
+    
+    def close(self):
+        """QUIT the connection if one is open"""
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            self.server.close()
+        self.server = None
+
+class _AsyncSMTPSession:
+    """aiosmtplib counterpart of _SMTPSession for send_batch_emails_async"""
+    
+    def __init__(self, provider: EmailProvider):
+        self.provider = provider
+        
+        # Parse server and port
+        server_parts = provider.api_endpoint.split(':')
+        self.smtp_server = server_parts[0]
+        self.smtp_port = int(server_parts[1]) if len(server_parts) > 1 else 587
+        self.server = None
+    
+    async def connect(self):
+        """Open the connection and run STARTTLS and AUTH once for the whole session"""
+        await self.close()
+        
+        print(f"   📨 Connecting to {self.smtp_server}:{self.smtp_port}")
+        server = aiosmtplib.SMTP(hostname=self.smtp_server, port=self.smtp_port, start_tls=True)
+        await server.connect()
+        try:
+            print(f"   🔐 Authenticating as {self.provider.sender_email}")
+            await server.login(self.provider.sender_email, self.provider.api_key)
+        except Exception:
+            server.close()
+            raise
+        self.server = server
+    
+    async def sendmail(self, to_address: str, message: str):
+        """Send on the live connection, reconnecting once if the server dropped it"""
+        if self.server is None:
+            await self.connect()
+        
+        try:
+            await self.server.sendmail(self.provider.sender_email, [to_address], message)
+        except aiosmtplib.SMTPServerDisconnected:
+            print(f"   🔄 SMTP connection closed by server, reconnecting...")
+            await self.connect()
+            await self.server.sendmail(self.provider.sender_email, [to_address], message)
+    
+    async def close(self):
+        """QUIT the connection if one is open"""
+        if self.server is None:
+            return
+        try:
+            await self.server.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            self.server.close()
+        self.server = None
+
 class OutreachAgent:
     """Agent responsible for REAL candidate outreach via email - ACTUAL EMAIL SENDING"""
     
@@ -130,9 +306,9 @@ This email was sent regarding the {{ job_title }} position. If you'd prefer not
                 candidate_data, job_data, recruiter_data
             )
             
-            # Render subject and body
-            subject_template = Template(template.subject_template)
-            body_template = Template(template.body_template)
+            # Render subject and body (compiled once per template source)
+            subject_template = _compile_template(template.subject_template)
+            body_template = _compile_template(template.body_template)
             
             subject = subject_template.render(**template_vars)
             body = body_template.render(**template_vars)
@@ -247,8 +423,8 @@ This email was sent regarding the {{ job_title }} position. If you'd prefer not
         
         return '. '.join(notes[:2]) + "."
     
-    def send_email(self, email: CandidateEmail) -> bool:
-        """Send a single email - REAL EMAIL SENDING"""
+    def send_email(self, email: CandidateEmail, session: Optional[_SMTPSession] = None) -> bool:
+        """Send a single email - REAL EMAIL SENDING (over `session` when given)"""
         
         try:
             print(f"📧 Sending REAL email to {email.candidate_name} ({email.candidate_email})")
@@ -261,92 +437,61 @@ This email was sent regarding the {{ job_title }} position. If you'd prefer not
             
             # Send real email or simulate based on configuration
             if self.use_real_email:
-                success = self._send_via_smtp(email)
+                success = self._send_via_smtp(email, session)
             else:
                 success = self._simulate_email_send(email)
             
-            if success:
-                email.status = EmailStatus.SENT
-                email.sent_at = datetime.now()
-                self.sent_emails.append(email)
-                
-                if self.use_real_email:
-                    print(f"✅ REAL email sent successfully to {email.candidate_name}")
-                    print(f"   📧 Check inbox: {email.candidate_email}")
-                    print(f"   📝 Subject: {email.subject}")
-                else:
-                    print(f"✅ Email simulated for {email.candidate_name}")
-                
-                # Mark as delivered (in real implementation, this would come from webhooks)
-                email.status = EmailStatus.DELIVERED
-                email.delivered_at = datetime.now()
-                
-                return True
-            else:
-                email.status = EmailStatus.FAILED
-                self.failed_emails.append(email)
-                print(f"❌ Failed to send email to {email.candidate_name}")
-                return False
+            return self._record_send(email, success)
                 
         except Exception as e:
-            logging.error(f"Error sending email to {email.candidate_email}: {e}")
+            return self._record_send_error(email, e)
+    
+    def _record_send(self, email: CandidateEmail, success: bool) -> bool:
+        """Update the email's status and the agent's sent/failed lists after a send attempt"""
+        if success:
+            email.status = EmailStatus.SENT
+            email.sent_at = datetime.now()
+            self.sent_emails.append(email)
+            
+            if self.use_real_email:
+                print(f"✅ REAL email sent successfully to {email.candidate_name}")
+                print(f"   📧 Check inbox: {email.candidate_email}")
+                print(f"   📝 Subject: {email.subject}")
+            else:
+                print(f"✅ Email simulated for {email.candidate_name}")
+            
+            # Mark as delivered (in real implementation, this would come from webhooks)
+            email.status = EmailStatus.DELIVERED
+            email.delivered_at = datetime.now()
+            
+            return True
+        else:
             email.status = EmailStatus.FAILED
             self.failed_emails.append(email)
-            print(f"❌ Email sending error: {e}")
+            print(f"❌ Failed to send email to {email.candidate_name}")
             return False
     
-    def _send_via_smtp(self, email: CandidateEmail) -> bool:
+    def _record_send_error(self, email: CandidateEmail, error: Exception) -> bool:
+        """Mark an email failed after an unexpected error while sending it"""
+        logging.error(f"Error sending email to {email.candidate_email}: {error}")
+        email.status = EmailStatus.FAILED
+        self.failed_emails.append(email)
+        print(f"❌ Email sending error: {error}")
+        return False
+    
+    def _send_via_smtp(self, email: CandidateEmail, session: Optional[_SMTPSession] = None) -> bool:
         """Send email via SMTP - REAL EMAIL IMPLEMENTATION"""
         
         try:
-            print(f"   🔗 Connecting to SMTP server: {self.email_provider.api_endpoint}")
-            
-            # Parse server and port
-            server_parts = self.email_provider.api_endpoint.split(':')
-            smtp_server = server_parts[0]
-            smtp_port = int(server_parts[1]) if len(server_parts) > 1 else 587
-            
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = email.subject
-            msg['From'] = f"{self.email_provider.sender_name} <{self.email_provider.sender_email}>"
-            msg['To'] = email.candidate_email
-            
-            # Create HTML and plain text versions
-            text_body = email.body
-            
-            # Convert plain text to HTML with basic formatting
-            html_body = email.body.replace('\n', '<br>\n')
-            html_body = f"""
-<!DOCTYPE html>
-<html>
-<body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-{html_body}
-</body>
-</html>
-"""
-            
-            # Attach both versions
-            part1 = MIMEText(text_body, 'plain')
-            part2 = MIMEText(html_body, 'html')
-            
-            msg.attach(part1)
-            msg.attach(part2)
-            
-            print(f"   📨 Connecting to {smtp_server}:{smtp_port}")
-            
-            # Send email via SMTP
-            server = smtplib.SMTP(smtp_server, smtp_port)
-            server.set_debuglevel(0)  # Set to 1 for debug output
-            server.starttls()
-            
-            print(f"   🔐 Authenticating as {self.email_provider.sender_email}")
-            server.login(self.email_provider.sender_email, self.email_provider.api_key)
-            
             print(f"   📤 Sending email...")
-            text = msg.as_string()
-            server.sendmail(self.email_provider.sender_email, email.candidate_email, text)
-            server.quit()
+            text = self._build_message(email)
+            
+            # Send over the batch's session, or a one-off session for a single email
+            if session is not None:
+                session.sendmail(email.candidate_email, text)
+            else:
+                with _SMTPSession(self.email_provider) as one_off:
+                    one_off.sendmail(email.candidate_email, text)
             
             print(f"   ✅ SMTP delivery successful!")
             return True
@@ -366,10 +511,41 @@ This email was sent regarding the {{ job_title }} position. If you'd prefer not
             logging.error(f"SMTP error details: {e}", exc_info=True)
             return False
     
+    def _build_message(self, email: CandidateEmail) -> str:
+        """Build the multipart plain-text/HTML message for an email"""
+        
+        # Create message
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = email.subject
+        msg['From'] = f"{self.email_provider.sender_name} <{self.email_provider.sender_email}>"
+        msg['To'] = email.candidate_email
+        
+        # Create HTML and plain text versions
+        text_body = email.body
+        
+        # Convert plain text to HTML with basic formatting
+        html_body = email.body.replace('\n', '<br>\n')
+        html_body = f"""
+<!DOCTYPE html>
+<html>
+<body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+{html_body}
+</body>
+</html>
+"""
+        
+        # Attach both versions
+        part1 = MIMEText(text_body, 'plain')
+        part2 = MIMEText(html_body, 'html')
+        
+        msg.attach(part1)
+        msg.attach(part2)
+        
+        return msg.as_string()
+    
     def _simulate_email_send(self, email: CandidateEmail) -> bool:
         """Simulate email sending for demo purposes"""
         time.sleep(0.5)
-        import random
         return random.random() < 0.95
     
     def _is_valid_email(self, email: str) -> bool:
@@ -379,7 +555,7 @@ This email was sent regarding the {{ job_title }} position. If you'd prefer not
     
     def send_batch_emails(self, emails: List[CandidateEmail], 
                          stagger_seconds: int = 30) -> Dict[str, Any]:
-        """Send multiple emails with staggering"""
+        """Send multiple emails over a pool of SMTP connections, staggering each connection's sends"""
         
         results = {
             'sent': [],
@@ -388,32 +564,184 @@ This email was sent regarding the {{ job_title }} position. If you'd prefer not
             'success_rate': 0.0
         }
         
+        provider = self.email_provider
+        workers = max(1, min(provider.concurrency, len(emails)))
+        
         mode = "REAL EMAILS" if self.use_real_email else "SIMULATION"
-        print(f"📤 Starting batch email send: {len(emails)} emails ({mode})")
+        print(f"📤 Starting batch email send: {len(emails)} emails ({mode}, {workers} connections)")
         
+        pending = queue.Queue()
         for i, email in enumerate(emails):
+            pending.put((i, email))
+        results_lock = threading.Lock()
+        
+        def send_worker():
+            # One SMTP connection (TLS handshake + login) per worker, recycled after
+            # max_messages_per_connection sends for providers that cap connections
+            session = _SMTPSession(provider) if self.use_real_email else None
+            sent_on_connection = 0
+            
             try:
-                print(f"\n📧 [{i+1}/{len(emails)}] Processing {email.candidate_name}...")
-                
-                success = self.send_email(email)
-                
-                if success:
-                    results['sent'].append(email.email_id)
-                else:
-                    results['failed'].append(email.email_id)
-                
-                # Progress update
-                print(f"📊 Progress: {i+1}/{len(emails)} emails processed")
-                
-                # Stagger emails to avoid rate limits (skip for last email)
-                if i < len(emails) - 1:
-                    print(f"⏳ Waiting {stagger_seconds} seconds before next email...")
-                    time.sleep(stagger_seconds)
+                while True:
+                    try:
+                        i, email = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    
+                    try:
+                        print(f"\n📧 [{i+1}/{len(emails)}] Processing {email.candidate_name}...")
+                        
+                        if session is not None and sent_on_connection >= provider.max_messages_per_connection:
+                            session.close()
+                            sent_on_connection = 0
+                        
+                        success = self.send_email(email, session)
+                        sent_on_connection += 1
+                        
+                        with results_lock:
+                            results['sent' if success else 'failed'].append(email.email_id)
+                            processed = len(results['sent']) + len(results['failed'])
+                        
+                        # Progress update
+                        print(f"📊 Progress: {processed}/{len(emails)} emails processed")
+                        
+                        # Stagger this connection's emails to avoid rate limits (skip once the queue is drained)
+                        if not pending.empty():
+                            print(f"⏳ Waiting {stagger_seconds} seconds before next email...")
+                            time.sleep(stagger_seconds)
+                        
+                    except Exception as e:
+                        logging.error(f"Error in batch send for email {email.email_id}: {e}")
+                        with results_lock:
+                            results['failed'].append(email.email_id)
+                        print(f"❌ Batch error for {email.candidate_name}: {e}")
+            finally:
+                if session is not None:
+                    session.close()
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(send_worker) for _ in range(workers)]:
+                future.result()
+        
+        return self._summarize_batch(emails, results)
+    
+    async def send_batch_emails_async(self, emails: List[CandidateEmail], 
+                                      stagger_seconds: int = 30) -> Dict[str, Any]:
+        """Async send_batch_emails: concurrent aiosmtplib connections on one event loop instead of threads"""
+        
+        if self.use_real_email and aiosmtplib is None:
+            raise ImportError("send_batch_emails_async requires the aiosmtplib package")
+        
+        results = {
+            'sent': [],
+            'failed': [],
+            'total': len(emails),
+            'success_rate': 0.0
+        }
+        
+        provider = self.email_provider
+        workers = max(1, min(provider.concurrency, len(emails)))
+        
+        mode = "REAL EMAILS" if self.use_real_email else "SIMULATION"
+        print(f"📤 Starting async batch email send: {len(emails)} emails ({mode}, {workers} connections)")
+        
+        pending = asyncio.Queue()
+        for i, email in enumerate(emails):
+            pending.put_nowait((i, email))
+        
+        async def send_worker():
+            # Same connection reuse and recycling as the threaded workers
+            session = _AsyncSMTPSession(provider) if self.use_real_email else None
+            sent_on_connection = 0
+            
+            try:
+                while not pending.empty():
+                    i, email = pending.get_nowait()
                     
-            except Exception as e:
-                logging.error(f"Error in batch send for email {email.email_id}: {e}")
-                results['failed'].append(email.email_id)
-                print(f"❌ Batch error for {email.candidate_name}: {e}")
+                    try:
+                        print(f"\n📧 [{i+1}/{len(emails)}] Processing {email.candidate_name}...")
+                        
+                        if session is not None and sent_on_connection >= provider.max_messages_per_connection:
+                            await session.close()
+                            sent_on_connection = 0
+                        
+                        success = await self._send_email_async(email, session)
+                        sent_on_connection += 1
+                        
+                        results['sent' if success else 'failed'].append(email.email_id)
+                        processed = len(results['sent']) + len(results['failed'])
+                        
+                        # Progress update
+                        print(f"📊 Progress: {processed}/{len(emails)} emails processed")
+                        
+                        # Stagger this connection's emails to avoid rate limits (skip once the queue is drained)
+                        if not pending.empty():
+                            print(f"⏳ Waiting {stagger_seconds} seconds before next email...")
+                            await asyncio.sleep(stagger_seconds)
+                        
+                    except Exception as e:
+                        logging.error(f"Error in batch send for email {email.email_id}: {e}")
+                        results['failed'].append(email.email_id)
+                        print(f"❌ Batch error for {email.candidate_name}: {e}")
+            finally:
+                if session is not None:
+                    await session.close()
+        
+        await asyncio.gather(*(send_worker() for _ in range(workers)))
+        
+        return self._summarize_batch(emails, results)
+    
+    async def _send_email_async(self, email: CandidateEmail, session: Optional[_AsyncSMTPSession]) -> bool:
+        """Async send_email over a worker's aiosmtplib session"""
+        
+        try:
+            print(f"📧 Sending REAL email to {email.candidate_name} ({email.candidate_email})")
+            
+            # Validate email address
+            if not self._is_valid_email(email.candidate_email):
+                logging.error(f"Invalid email address: {email.candidate_email}")
+                email.status = EmailStatus.FAILED
+                return False
+            
+            # Send real email or simulate based on configuration
+            if session is not None:
+                success = await self._send_via_smtp_async(email, session)
+            else:
+                await asyncio.sleep(0.5)
+                success = random.random() < 0.95
+            
+            return self._record_send(email, success)
+                
+        except Exception as e:
+            return self._record_send_error(email, e)
+    
+    async def _send_via_smtp_async(self, email: CandidateEmail, session: _AsyncSMTPSession) -> bool:
+        """Send one email on an aiosmtplib session"""
+        
+        try:
+            print(f"   📤 Sending email...")
+            await session.sendmail(email.candidate_email, self._build_message(email))
+            
+            print(f"   ✅ SMTP delivery successful!")
+            return True
+            
+        except aiosmtplib.SMTPAuthenticationError as e:
+            print(f"   ❌ SMTP Authentication failed: {e}")
+            print(f"   💡 Check your email credentials in the configuration")
+            return False
+        except aiosmtplib.SMTPRecipientsRefused as e:
+            print(f"   ❌ Recipient email rejected: {e}")
+            return False
+        except aiosmtplib.SMTPServerDisconnected as e:
+            print(f"   ❌ SMTP server disconnected: {e}")
+            return False
+        except Exception as e:
+            print(f"   ❌ SMTP error: {e}")
+            logging.error(f"SMTP error details: {e}", exc_info=True)
+            return False
+    
+    def _summarize_batch(self, emails: List[CandidateEmail], results: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in the batch success rate and print the batch summary"""
         
         # Calculate success rate
         if results['total'] > 0:
@@ -1,15 +1,108 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, FrozenSet, Tuple
 from datetime import datetime
+from functools import lru_cache
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import os
 import re
-from fuzzywuzzy import fuzz
+import sys
+import threading
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
 from models.screening import ScreeningCriteria, ScreeningResult, SkillMatch, ScreeningSummary
 from models.sourcing import CandidateProfile, SourceChannel
 from utils import create_candidate_from_raw_data
 import logging
 
+logger = logging.getLogger(__name__)
+
+# City part of a "City, State" location
+_CITY_RE = re.compile(r'^\s*([^,]+?)\s*(?:,|$)')
+
+@lru_cache(maxsize=256)
+def _normalise_skills(skills: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Stripped, lower-cased, interned job skills; a job's lists are normalised once, not per candidate"""
+    return tuple(sys.intern(skill.strip().lower()) for skill in skills)
+
+@lru_cache(maxsize=32)
+def _make_scorer(w_required: float, w_preferred: float, w_experience: float,
+                 w_location: float, w_education: float, include_education: bool):
+    """Build a scoring function with the criteria weights bound as locals"""
+    
+    total_weight = w_required + w_preferred + w_experience + w_location + w_education
+    inv_total_weight = 1.0 / total_weight if total_weight > 0 else 0.0
+    
+    def score(required, preferred, experience, location, education):
+        # Overall score (simple average)
+        if include_education:
+            overall = (required + preferred + experience + location + education) / 5
+        else:
+            overall = (required + preferred + experience + location) / 4
+        
+        # Weighted score
+        if total_weight > 0:
+            weighted = (
+                required * w_required +
+                preferred * w_preferred +
+                experience * w_experience +
+                location * w_location +
+                education * w_education
+            ) * inv_total_weight
+        else:
+            weighted = overall
+        
+        return overall, weighted
+    
+    return score
+
+# Below this many candidates the cost of starting worker processes outweighs the gain
+PARALLEL_SCREENING_MIN_BATCH = 200
+
+# Agent owned by each worker process of screen_candidates_batch
+_worker_agent = None
+
+def _init_screening_worker(agent: "ScreeningAgent"):
+    """Install the agent used by this worker process"""
+    global _worker_agent
+    _worker_agent = agent
+
+def _error_result(candidate_data: Dict[str, Any], error: Exception) -> ScreeningResult:
+    """Build the zero-score result recorded for a candidate whose screening failed"""
+    return ScreeningResult(
+        candidate_id=str(candidate_data.get('source_id', candidate_data.get('id', 'unknown'))),
+        candidate_name=str(candidate_data.get('name') or 'Unknown'),
+        experience_years=candidate_data.get('experience_years', 0),
+        candidate_location=candidate_data.get('location', ''),
+        required_skills_score=0.0,
+        preferred_skills_score=0.0,
+        experience_score=0.0,
+        experience_level_match="under",
+        location_score=0.0,
+        location_match=False,
+        education_score=0.0,
+        education_match=False,
+        overall_score=0.0,
+        weighted_score=0.0,
+        passes_screening=False,
+        recommended_for_shortlist=False,
+        skill_matches=[],
+        missing_critical_skills=[],
+        strengths=[],
+        concerns=[f"Error during screening: {str(error)}"]
+    )
+
+def _screen_in_worker(candidate_data: Dict[str, Any], job_requirements: Dict[str, Any],
+                      screening_criteria: ScreeningCriteria) -> ScreeningResult:
+    """Screen one candidate with the worker's agent"""
+    return _worker_agent.screen_candidate(candidate_data, job_requirements, screening_criteria)
+
 class ScreeningAgent:
     """Agent responsible for candidate screening and scoring - FIXED VERSION"""
     
+    _default_instance = None
+    _default_lock = threading.Lock()
+    
     def __init__(self):
         # Skill synonyms and related terms for better matching
         self.skill_synonyms = {
@@ -30,190 +123,218 @@ class ScreeningAgent:
             "api": ["api", "rest api", "restful", "web services"],
             "agile": ["agile", "scrum", "kanban"],
         }
+        
+        # Frozen, interned synonym sets make the synonym check a single set operation
+        self.skill_synonyms = {
+            sys.intern(canonical): frozenset(sys.intern(synonym) for synonym in synonyms)
+            for canonical, synonyms in self.skill_synonyms.items()
+        }
+        
+        # Candidates often share skill sets, so matches are memoised per
+        # (required skill, normalised candidate skills) for the agent's lifetime
+        self._match_skill_cached = lru_cache(maxsize=4096)(self._match_skill)
+    
+    @classmethod
+    def get_default(cls) -> "ScreeningAgent":
+        """Shared agent, created on first use, so its skill-match cache outlives one workflow run"""
+        with cls._default_lock:
+            if cls._default_instance is None:
+                cls._default_instance = cls()
+            return cls._default_instance
+    
+    def __getstate__(self):
+        # The memoised matcher can't be pickled; workers rebuild it
+        state = self.__dict__.copy()
+        del state['_match_skill_cached']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._match_skill_cached = lru_cache(maxsize=4096)(self._match_skill)
+    
+    def screen_candidates_batch(self, candidates: List[Dict[str, Any]], job_requirements: Dict[str, Any],
+                                screening_criteria: ScreeningCriteria,
+                                max_workers: Optional[int] = None) -> List[ScreeningResult]:
+        """Screen a batch of candidates, spreading large batches across CPU cores"""
+        
+        workers = max_workers or os.cpu_count() or 1
+        if workers == 1 or len(candidates) < PARALLEL_SCREENING_MIN_BATCH:
+            return [self.screen_candidate(candidate_data, job_requirements, screening_criteria)
+                    for candidate_data in candidates]
+        
+        chunksize = max(1, len(candidates) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_screening_worker,
+                                 initargs=(self,)) as executor:
+            return list(executor.map(
+                _screen_in_worker, candidates, repeat(job_requirements), repeat(screening_criteria),
+                chunksize=chunksize
+            ))
     
     def screen_candidate(self, candidate_data: Dict[str, Any], job_requirements: Dict[str, Any], 
                         screening_criteria: ScreeningCriteria) -> ScreeningResult:
         """Screen a single candidate against job requirements - FIXED VERSION"""
-        
         try:
-            # Create candidate profile from raw data
-            source_channel = SourceChannel.DATABASE  # Default for screening stage
-            if 'source' in candidate_data:
-                source_map = {
-                    'linkedin': SourceChannel.LINKEDIN,
-                    'indeed': SourceChannel.INDEED,
-                    'database': SourceChannel.DATABASE
-                }
-                source_channel = source_map.get(candidate_data['source'], SourceChannel.DATABASE)
-            
-            candidate = create_candidate_from_raw_data(candidate_data, source_channel)
-            
-            print(f"    🔍 Analyzing: {candidate.name} ({candidate.source_id})")
-            
-            # Initialize screening result with all required fields
-            result = ScreeningResult(
-                candidate_id=candidate.source_id,
-                candidate_name=candidate.name or "Unknown",
-                experience_years=candidate.experience_years,
-                candidate_location=candidate.location,
-                # Initialize all required fields with default values
-                required_skills_score=0.0,
-                preferred_skills_score=0.0,
-                experience_score=0.0,
-                experience_level_match="under",
-                location_score=0.0,
-                location_match=False,
-                education_score=0.0,
-                education_match=False,
-                overall_score=0.0,
-                weighted_score=0.0,
-                passes_screening=False,
-                recommended_for_shortlist=False,
-                skill_matches=[],
-                missing_critical_skills=[],
-                strengths=[],
-                concerns=[]
-            )
-            
-            # Perform analysis
-            self._analyze_skills(candidate, job_requirements, result)
-            self._analyze_experience(candidate, job_requirements, screening_criteria, result)
-            self._analyze_location(candidate, job_requirements, screening_criteria, result)
-            self._analyze_education(candidate, job_requirements, screening_criteria, result)
-            
-            # Calculate scores
-            self._calculate_scores(result, screening_criteria)
-            
-            # Make decisions
-            self._make_decisions(result, screening_criteria)
-            
-            # Generate insights
-            self._generate_insights(result, candidate)
-            
-            print(f"      📊 Score: {result.weighted_score:.1f} | Pass: {result.passes_screening} | Shortlist: {result.recommended_for_shortlist}")
-            
-            return result
-            
+            return self._screen_candidate(candidate_data, job_requirements, screening_criteria)
         except Exception as e:
             logging.error(f"Error in screen_candidate: {e}", exc_info=True)
             # Return a minimal valid result on error
-            return ScreeningResult(
-                candidate_id=candidate_data.get('source_id', candidate_data.get('id', 'unknown')),
-                candidate_name=candidate_data.get('name', 'Unknown'),
-                experience_years=candidate_data.get('experience_years', 0),
-                candidate_location=candidate_data.get('location', ''),
-                required_skills_score=0.0,
-                preferred_skills_score=0.0,
-                experience_score=0.0,
-                experience_level_match="under",
-                location_score=0.0,
-                location_match=False,
-                education_score=0.0,
-                education_match=False,
-                overall_score=0.0,
-                weighted_score=0.0,
-                passes_screening=False,
-                recommended_for_shortlist=False,
-                skill_matches=[],
-                missing_critical_skills=[],
-                strengths=[],
-                concerns=[f"Error during screening: {str(e)}"]
-            )
+            return _error_result(candidate_data, e)
+    
+    def _screen_candidate(self, candidate_data: Dict[str, Any], job_requirements: Dict[str, Any], 
+                          screening_criteria: ScreeningCriteria) -> ScreeningResult:
+        """Score one candidate, letting any error propagate to screen_candidate"""
+        
+        # Create candidate profile from raw data
+        source_channel = SourceChannel.DATABASE  # Default for screening stage
+        if 'source' in candidate_data:
+            source_map = {
+                'linkedin': SourceChannel.LINKEDIN,
+                'indeed': SourceChannel.INDEED,
+                'database': SourceChannel.DATABASE
+            }
+            source_channel = source_map.get(candidate_data['source'], SourceChannel.DATABASE)
+        
+        candidate = create_candidate_from_raw_data(candidate_data, source_channel)
+        
+        logger.debug("🔍 Analyzing: %s (%s)", candidate.name, candidate.source_id)
+        
+        # Perform analysis
+        required_score, preferred_score, skill_matches, missing_critical = \
+            self._analyze_skills(candidate, job_requirements)
+        experience_score, experience_level_match = \
+            self._analyze_experience(candidate, job_requirements, screening_criteria)
+        location_score, location_match = \
+            self._analyze_location(candidate, job_requirements, screening_criteria)
+        education_score, education_match = \
+            self._analyze_education(candidate, job_requirements, screening_criteria)
+        
+        # Calculate scores
+        overall_score, weighted_score = self._calculate_scores(
+            required_score, preferred_score, experience_score,
+            location_score, education_score, screening_criteria
+        )
+        
+        fields = {
+            "candidate_id": candidate.source_id,
+            "candidate_name": candidate.name or "Unknown",
+            "experience_years": candidate.experience_years,
+            "candidate_location": candidate.location,
+            "required_skills_score": required_score,
+            "preferred_skills_score": preferred_score,
+            "skill_matches": skill_matches,
+            "missing_critical_skills": missing_critical,
+            "experience_score": experience_score,
+            "experience_level_match": experience_level_match,
+            "location_score": location_score,
+            "location_match": location_match,
+            "education_score": education_score,
+            "education_match": education_match,
+            "overall_score": overall_score,
+            "weighted_score": weighted_score,
+        }
+        
+        # Make decisions
+        fields["passes_screening"], fields["recommended_for_shortlist"] = \
+            self._make_decisions(fields, screening_criteria)
+        
+        # Generate insights
+        fields["strengths"], fields["concerns"] = self._generate_insights(fields)
+        
+        result = ScreeningResult(**fields)
+        
+        logger.debug("📊 Score: %.1f | Pass: %s | Shortlist: %s",
+                     result.weighted_score, result.passes_screening, result.recommended_for_shortlist)
+        
+        return result
     
-    def _analyze_skills(self, candidate: CandidateProfile, job_requirements: Dict[str, Any], 
-                       result: ScreeningResult):
-        """Analyze candidate skills against job requirements"""
+    def _analyze_skills(self, candidate: CandidateProfile, job_requirements: Dict[str, Any]
+                       ) -> Tuple[float, float, List[SkillMatch], List[str]]:
+        """Analyze candidate skills, returning (required score, preferred score, matches, missing)"""
         
         required_skills = job_requirements.get('required_skills', [])
         preferred_skills = job_requirements.get('preferred_skills', [])
-        candidate_skills = [skill.lower() for skill in candidate.skills]
+        # Normalise once per candidate; _match_skill compares these as-is
+        candidate_skills = frozenset(sys.intern(skill.strip().lower()) for skill in candidate.skills)
         
-        print(f"        Skills: {candidate.skills}")
-        print(f"        Required: {required_skills}")
+        logger.debug("Skills: %s", candidate.skills)
+        logger.debug("Required: %s", required_skills)
         
         # Analyze required skills
-        required_matches = []
-        missing_critical = []
-        
-        for skill in required_skills:
-            skill_match = self._match_skill(skill, candidate_skills)
-            required_matches.append(skill_match)
-            
-            if not skill_match.found:
-                missing_critical.append(skill)
+        required_matches = self._match_skills(required_skills, candidate_skills)
+        missing_critical = [match.skill_name for match in required_matches if not match.found]
         
         # Analyze preferred skills
-        preferred_matches = []
-        for skill in preferred_skills:
-            skill_match = self._match_skill(skill, candidate_skills)
-            preferred_matches.append(skill_match)
+        preferred_matches = self._match_skills(preferred_skills, candidate_skills)
         
         # Calculate scores
         required_score = self._calculate_skill_score(required_matches) if required_matches else 100.0
         preferred_score = self._calculate_skill_score(preferred_matches) if preferred_matches else 0.0
         
-        # Update result
-        result.required_skills_score = required_score
-        result.preferred_skills_score = preferred_score
-        result.skill_matches = required_matches + preferred_matches
-        result.missing_critical_skills = missing_critical
+        logger.debug("Required skills score: %.1f", required_score)
+        logger.debug("Missing: %s", missing_critical)
         
-        print(f"        Required skills score: {required_score:.1f}")
-        print(f"        Missing: {missing_critical}")
+        return required_score, preferred_score, required_matches + preferred_matches, missing_critical
     
-    def _match_skill(self, required_skill: str, candidate_skills: List[str]) -> SkillMatch:
-        """Match a required skill against candidate skills"""
+    def _match_skills(self, skills: List[str], candidate_skills: FrozenSet[str]) -> List[SkillMatch]:
+        """Match skills in order, resolving verbatim hits with one set intersection"""
         
-        required_lower = required_skill.lower()
+        normalised = _normalise_skills(tuple(skills))
+        exact_hits = candidate_skills.intersection(normalised)
+        
+        return [
+            SkillMatch.model_construct(skill_name=skill, found=True, match_type="exact", confidence=1.0)
+            if skill_lower in exact_hits else self._match_skill_cached(skill, candidate_skills)
+            for skill, skill_lower in zip(skills, normalised)
+        ]
+    
+    def _match_skill(self, required_skill: str, candidate_skills: FrozenSet[str]) -> SkillMatch:
+        """Match a required skill against pre-normalised (stripped, lower-cased) candidate skills"""
+        
+        required_lower = required_skill.strip().lower()
         
         # Check for exact match
         if required_lower in candidate_skills:
-            return SkillMatch(
+            return SkillMatch.model_construct(
                 skill_name=required_skill,
                 found=True,
                 match_type="exact",
                 confidence=1.0
             )
         
-        # Check synonyms
-        synonyms = self.skill_synonyms.get(required_lower, [required_lower])
-        for synonym in synonyms:
-            if synonym in candidate_skills:
-                return SkillMatch(
-                    skill_name=required_skill,
-                    found=True,
-                    match_type="exact",
-                    confidence=0.95
-                )
+        # Check synonyms (only canonical skills have a synonym group)
+        synonyms = self.skill_synonyms.get(required_lower)
+        if synonyms is not None and not synonyms.isdisjoint(candidate_skills):
+            return SkillMatch.model_construct(
+                skill_name=required_skill,
+                found=True,
+                match_type="exact",
+                confidence=0.95
+            )
         
         # Check for partial matches using fuzzy matching
-        best_match_score = 0
-        best_match_skill = None
-        
-        for candidate_skill in candidate_skills:
-            # Use fuzzy matching
-            similarity = fuzz.partial_ratio(required_lower, candidate_skill)
-            if similarity > best_match_score:
-                best_match_score = similarity
-                best_match_skill = candidate_skill
+        best_match = process.extractOne(
+            required_lower, candidate_skills, scorer=fuzz.partial_ratio,
+            processor=None, score_cutoff=70
+        )
+        best_match_score = best_match[1] if best_match else 0
         
         # Determine match type based on similarity
         if best_match_score >= 85:
-            return SkillMatch(
+            return SkillMatch.model_construct(
                 skill_name=required_skill,
                 found=True,
                 match_type="partial",
                 confidence=best_match_score / 100.0
             )
         elif best_match_score >= 70:
-            return SkillMatch(
+            return SkillMatch.model_construct(
                 skill_name=required_skill,
                 found=True,
                 match_type="related",
                 confidence=best_match_score / 100.0
             )
         else:
-            return SkillMatch(
+            return SkillMatch.model_construct(
                 skill_name=required_skill,
                 found=False,
                 match_type="none",
@@ -225,215 +346,171 @@ class ScreeningAgent:
         if not matches:
             return 0.0
         
-        total_score = sum(match.confidence * 100 for match in matches)
-        return total_score / len(matches)
+        return sum(match.confidence for match in matches) * 100 / len(matches)
     
     def _analyze_experience(self, candidate: CandidateProfile, job_requirements: Dict[str, Any],
-                           screening_criteria: ScreeningCriteria, result: ScreeningResult):
-        """Analyze candidate experience"""
+                           screening_criteria: ScreeningCriteria) -> Tuple[float, str]:
+        """Analyze candidate experience, returning (score, level match)"""
         
         candidate_exp = candidate.experience_years or 0
         min_required = screening_criteria.min_experience_years
         preferred_exp = screening_criteria.preferred_experience_years
         
-        print(f"        Experience: {candidate_exp} years (min: {min_required}, preferred: {preferred_exp})")
+        logger.debug("Experience: %s years (min: %s, preferred: %s)", candidate_exp, min_required, preferred_exp)
         
         # Determine experience level match
         if candidate_exp < min_required:
-            result.experience_level_match = "under"
+            level_match = "under"
             score = max(0, (candidate_exp / min_required) * 60) if min_required > 0 else 60
         elif candidate_exp >= preferred_exp:
-            result.experience_level_match = "exceeds"
+            level_match = "exceeds"
             score = min(100, 80 + (candidate_exp - preferred_exp) * 2)
         else:
-            result.experience_level_match = "meets"
+            level_match = "meets"
             # Linear interpolation between minimum and preferred
             if preferred_exp > min_required:
                 score = 60 + ((candidate_exp - min_required) / (preferred_exp - min_required)) * 40
             else:
                 score = 80  # Default good score if min == preferred
         
-        result.experience_score = score
-        print(f"        Experience score: {score:.1f} ({result.experience_level_match})")
+        logger.debug("Experience score: %.1f (%s)", score, level_match)
+        
+        return score, level_match
     
     def _analyze_location(self, candidate: CandidateProfile, job_requirements: Dict[str, Any],
-                         screening_criteria: ScreeningCriteria, result: ScreeningResult):
-        """Analyze candidate location compatibility"""
+                         screening_criteria: ScreeningCriteria) -> Tuple[float, bool]:
+        """Analyze candidate location compatibility, returning (score, match)"""
         
         job_location = job_requirements.get('location', '')
         candidate_location = candidate.location or ''
         
-        print(f"        Location: {candidate_location} vs {job_location}")
+        logger.debug("Location: %s vs %s", candidate_location, job_location)
         
         # Check for remote work
         if screening_criteria.allow_remote or 'remote' in candidate_location.lower():
-            result.location_score = 100.0
-            result.location_match = True
-            print(f"        Location score: 100.0 (remote allowed)")
-            return
+            logger.debug("Location score: 100.0 (remote allowed)")
+            return 100.0, True
         
         # Check for exact location match
         if job_location.lower() in candidate_location.lower():
-            result.location_score = 100.0
-            result.location_match = True
-            print(f"        Location score: 100.0 (exact match)")
-            return
+            logger.debug("Location score: 100.0 (exact match)")
+            return 100.0, True
         
         # Check preferred locations
         for preferred in screening_criteria.preferred_locations:
             if preferred.lower() in candidate_location.lower():
-                result.location_score = 90.0
-                result.location_match = True
-                print(f"        Location score: 90.0 (preferred location)")
-                return
+                logger.debug("Location score: 90.0 (preferred location)")
+                return 90.0, True
         
         # Check for same city/state using fuzzy matching
         if job_location and candidate_location:
-            location_similarity = fuzz.partial_ratio(job_location.lower(), candidate_location.lower())
+            # Token-set comparison suits "City, State" strings; returns 0 below the cutoff
+            location_similarity = fuzz.token_set_ratio(
+                job_location, candidate_location, processor=default_process, score_cutoff=80
+            )
             if location_similarity >= 80:
-                result.location_score = location_similarity
-                result.location_match = True
-                print(f"        Location score: {location_similarity:.1f} (fuzzy match)")
-            else:
-                result.location_score = 30.0
-                result.location_match = False
-                print(f"        Location score: 30.0 (no match)")
-        else:
-            result.location_score = 50.0  # Neutral score if missing data
-            result.location_match = False
-            print(f"        Location score: 50.0 (missing data)")
+                logger.debug("Location score: %.1f (fuzzy match)", location_similarity)
+                return location_similarity, True
+            logger.debug("Location score: 30.0 (no match)")
+            return 30.0, False
+        
+        logger.debug("Location score: 50.0 (missing data)")
+        return 50.0, False  # Neutral score if missing data
     
     def _analyze_education(self, candidate: CandidateProfile, job_requirements: Dict[str, Any],
-                          screening_criteria: ScreeningCriteria, result: ScreeningResult):
-        """Analyze candidate education"""
+                          screening_criteria: ScreeningCriteria) -> Tuple[float, bool]:
+        """Analyze candidate education, returning (score, match)"""
         
         if not screening_criteria.education_required:
-            result.education_score = 100.0
-            result.education_match = True
-            return
+            return 100.0, True
         
         education_requirements = job_requirements.get('education_requirements', [])
         candidate_education = candidate.education
         
         if not education_requirements:
-            result.education_score = 100.0
-            result.education_match = True
-            return
+            return 100.0, True
         
         if not candidate_education:
-            result.education_score = 0.0
-            result.education_match = False
-            return
+            return 0.0, False
         
         # Check for education match
         for req_education in education_requirements:
             for candidate_edu in candidate_education:
                 similarity = fuzz.partial_ratio(req_education.lower(), candidate_edu.lower())
                 if similarity >= 70:
-                    result.education_score = similarity
-                    result.education_match = True
-                    return
+                    return similarity, True
         
-        result.education_score = 30.0  # Some credit for having education
-        result.education_match = False
+        return 30.0, False  # Some credit for having education
     
-    def _calculate_scores(self, result: ScreeningResult, criteria: ScreeningCriteria):
+    def _calculate_scores(self, required: float, preferred: float, experience: float,
+                          location: float, education: float,
+                          criteria: ScreeningCriteria) -> Tuple[float, float]:
         """Calculate overall and weighted scores"""
         
-        # Overall score (simple average)
-        scores = [
-            result.required_skills_score,
-            result.preferred_skills_score,
-            result.experience_score,
-            result.location_score
-        ]
-        
-        if criteria.education_required:
-            scores.append(result.education_score)
+        # Criteria are fixed for a batch, so the scorer is built once per set of weights;
+        # it is looked up by value on every call, never stored on the (shared) agent
+        scorer = _make_scorer(criteria.required_skills_weight, criteria.preferred_skills_weight,
+                              criteria.experience_weight, criteria.location_weight,
+                              criteria.education_weight, criteria.education_required)
         
-        result.overall_score = sum(scores) / len(scores)
-        
-        # Weighted score
-        weighted_sum = (
-            result.required_skills_score * criteria.required_skills_weight +
-            result.preferred_skills_score * criteria.preferred_skills_weight +
-            result.experience_score * criteria.experience_weight +
-            result.location_score * criteria.location_weight +
-            result.education_score * criteria.education_weight
-        )
-        
-        total_weight = (
-            criteria.required_skills_weight +
-            criteria.preferred_skills_weight +
-            criteria.experience_weight +
-            criteria.location_weight +
-            criteria.education_weight
-        )
-        
-        result.weighted_score = weighted_sum / total_weight if total_weight > 0 else result.overall_score
+        return scorer(required, preferred, experience, location, education)
     
-    def _make_decisions(self, result: ScreeningResult, criteria: ScreeningCriteria):
-        """Make pass/fail and shortlist decisions"""
+    def _make_decisions(self, fields: Dict[str, Any], criteria: ScreeningCriteria) -> Tuple[bool, bool]:
+        """Make pass/fail and shortlist decisions, returning (passes, shortlisted)"""
         
         # Check for critical missing skills (auto-fail)
-        if len(result.missing_critical_skills) > 2:  # Allow missing up to 2 critical skills
-            result.passes_screening = False
-            result.recommended_for_shortlist = False
-            return
+        if len(fields["missing_critical_skills"]) > 2:  # Allow missing up to 2 critical skills
+            return False, False
         
         # Check minimum experience requirement
-        if result.experience_level_match == "under" and result.experience_score < 30:
-            result.passes_screening = False
-            result.recommended_for_shortlist = False
-            return
+        if fields["experience_level_match"] == "under" and fields["experience_score"] < 30:
+            return False, False
         
         # Use weighted score for final decisions
-        score_to_use = result.weighted_score
+        score_to_use = fields["weighted_score"]
         
-        result.passes_screening = score_to_use >= criteria.pass_threshold
-        result.recommended_for_shortlist = score_to_use >= criteria.shortlist_threshold
+        return score_to_use >= criteria.pass_threshold, score_to_use >= criteria.shortlist_threshold
     
-    def _generate_insights(self, result: ScreeningResult, candidate: CandidateProfile):
-        """Generate insights about the candidate"""
+    def _generate_insights(self, fields: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+        """Generate insights about the candidate, returning (strengths, concerns)"""
         
         strengths = []
         concerns = []
         
         # Skill insights
-        if result.required_skills_score >= 80:
+        if fields["required_skills_score"] >= 80:
             strengths.append("Strong technical skills match")
-        elif result.required_skills_score < 50:
+        elif fields["required_skills_score"] < 50:
             concerns.append("Missing several required skills")
         
-        if result.preferred_skills_score >= 60:
+        if fields["preferred_skills_score"] >= 60:
             strengths.append("Good preferred skills coverage")
         
         # Experience insights
-        if result.experience_level_match == "exceeds":
+        if fields["experience_level_match"] == "exceeds":
             strengths.append("Highly experienced candidate")
-        elif result.experience_level_match == "under":
+        elif fields["experience_level_match"] == "under":
             concerns.append("Below minimum experience requirement")
         
         # Location insights
-        if result.location_match:
+        if fields["location_match"]:
             strengths.append("Location compatible")
         else:
             concerns.append("Location may require relocation")
         
         # Specific skill gaps
-        if result.missing_critical_skills:
-            concerns.append(f"Missing critical skills: {', '.join(result.missing_critical_skills[:3])}")
+        if fields["missing_critical_skills"]:
+            concerns.append(f"Missing critical skills: {', '.join(fields['missing_critical_skills'][:3])}")
         
         # Overall assessment
-        if result.weighted_score >= 85:
+        if fields["weighted_score"] >= 85:
             strengths.append("Excellent overall candidate")
-        elif result.weighted_score >= 70:
+        elif fields["weighted_score"] >= 70:
             strengths.append("Good candidate match")
-        elif result.weighted_score < 50:
+        elif fields["weighted_score"] < 50:
             concerns.append("Significant gaps in requirements")
         
-        result.strengths = strengths
-        result.concerns = concerns
+        return strengths, concerns
     
     def generate_screening_summary(self, results: List[ScreeningResult], 
                                  processing_time: float) -> ScreeningSummary:
@@ -455,40 +532,43 @@ class ScreeningAgent:
                 error_count=0
             )
         
-        # Basic counts
+        # Collect counts, score statistics and distributions in a single pass
         total = len(results)
-        passed = sum(1 for r in results if r.passes_screening)
-        shortlisted = sum(1 for r in results if r.recommended_for_shortlist)
-        rejected = total - passed
-        
-        # Score statistics
-        scores = [r.weighted_score for r in results]
-        avg_score = sum(scores) / len(scores)
-        highest_score = max(scores)
-        lowest_score = min(scores)
-        
-        # Common missing skills
-        all_missing_skills = []
-        for result in results:
-            all_missing_skills.extend(result.missing_critical_skills)
-        
-        from collections import Counter
-        missing_counter = Counter(all_missing_skills)
-        most_common_missing = [skill for skill, count in missing_counter.most_common(5)]
-        
-        # Experience distribution
+        passed = 0
+        shortlisted = 0
+        score_sum = 0.0
+        highest_score = float('-inf')
+        lowest_score = float('inf')
+        missing_counter = Counter()
         exp_distribution = {}
+        loc_distribution = Counter()
+        
         for result in results:
+            if result.passes_screening:
+                passed += 1
+            if result.recommended_for_shortlist:
+                shortlisted += 1
+            
+            score = result.weighted_score
+            score_sum += score
+            if score > highest_score:
+                highest_score = score
+            if score < lowest_score:
+                lowest_score = score
+            
+            missing_counter.update(result.missing_critical_skills)
+            
             level = result.experience_level_match
             exp_distribution[level] = exp_distribution.get(level, 0) + 1
-        
-        # Location distribution
-        loc_distribution = {}
-        for result in results:
+            
             if result.candidate_location:
                 # Extract city from location
-                city = result.candidate_location.split(',')[0].strip()
-                loc_distribution[city] = loc_distribution.get(city, 0) + 1
+                city_match = _CITY_RE.match(result.candidate_location)
+                loc_distribution[city_match.group(1) if city_match else result.candidate_location] += 1
+        
+        rejected = total - passed
+        avg_score = score_sum / total
+        most_common_missing = [skill for skill, count in missing_counter.most_common(5)]
         
         return ScreeningSummary(
             total_candidates=total,
@@ -500,7 +580,7 @@ class ScreeningAgent:
             lowest_score=lowest_score,
             most_common_missing_skills=most_common_missing,
             experience_distribution=exp_distribution,
-            location_distribution=dict(list(loc_distribution.items())[:5]),
+            location_distribution=dict(loc_distribution.most_common(5)),
             processing_time_seconds=processing_time,
             error_count=0
         )
\ No newline at end of file
@@ -5,29 +5,34 @@ from source_tools.DatabaseSourcingTool import create_database_tool
 from source_tools.IndeedAPITool import create_indeed_tool
 from source_tools.linkedInJobAPITool import create_linkedin_tool
 from models.sourcing import SourcingState, SourceChannel
-from utils import create_candidate_from_raw_data
+from utils import candidate_dict_from_raw_data
 import logging
 
+# Tool factories by tool name; tools are only built when a channel is first used
+_TOOL_FACTORIES = {
+    "linkedin_sourcer": create_linkedin_tool,
+    "indeed_sourcer": create_indeed_tool,
+    "database_sourcer": create_database_tool,
+}
+
 class SourcingAgent:
     """Main sourcing agent - Updated for current LangGraph API"""
     
     def __init__(self, llm_model: str = "gpt-4", api_keys: Optional[Dict[str, str]] = None):
         self.llm = ChatOpenAI(model=llm_model, temperature=0)
         self.api_keys = api_keys or {}
-        self.tools = self._initialize_tools()
+        self._tool_cache: Dict[str, StructuredTool] = {}
         # No longer using ToolExecutor - tools are called directly
-        
-    def _initialize_tools(self) -> List[StructuredTool]:
-        """Initialize all sourcing tools"""
-        return [
-            create_linkedin_tool(),
-            create_indeed_tool(),
-            create_database_tool()
-        ]
     
     def get_tool_by_name(self, tool_name: str) -> Optional[StructuredTool]:
-        """Get tool by name"""
-        return next((tool for tool in self.tools if tool.name == tool_name), None)
+        """Get tool by name, creating it on first use"""
+        tool = self._tool_cache.get(tool_name)
+        if tool is None:
+            factory = _TOOL_FACTORIES.get(tool_name)
+            if factory is None:
+                return None
+            tool = self._tool_cache[tool_name] = factory()
+        return tool
     
     def source_from_channel(self, channel: str, state: SourcingState) -> List[Dict[str, Any]]:
         """Source candidates from a specific channel"""
@@ -70,19 +75,13 @@ class SourcingAgent:
                     "max_results": state["max_candidates_per_channel"]
                 })
             
-            # Convert to candidate profiles and back to dicts for state storage
-            candidates = []
-            for raw_candidate in raw_results:
-                # Create candidate profile
-                source_channel = SourceChannel.LINKEDIN if channel == "linkedin" else \
-                                SourceChannel.INDEED if channel == "indeed" else \
-                                SourceChannel.DATABASE
-                
-                candidate = create_candidate_from_raw_data(raw_candidate, source_channel)
-                # Convert back to dict for JSON serialization in state
-                candidates.append(candidate.model_dump())
+            source_channel = SourceChannel.LINKEDIN if channel == "linkedin" else \
+                            SourceChannel.INDEED if channel == "indeed" else \
+                            SourceChannel.DATABASE
             
-            return candidates
+            # Build candidate-profile dicts directly for JSON serialization in state
+            return [candidate_dict_from_raw_data(raw_candidate, source_channel)
+                    for raw_candidate in raw_results]
             
         except Exception as e:
             logging.error(f"Error sourcing from {channel}: {e}")
@@ -1,35 +1,334 @@
 import sqlite3
 import json
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import queue
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 import logging
 
+try:
+    import orjson
+    
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import aiosqlite
+    from aiosqlitepool import SQLiteConnectionPool
+except ImportError:
+    aiosqlite = None
+    SQLiteConnectionPool = None
+
+logger = logging.getLogger(__name__)
+
+# Years-of-experience range for each experience level
+_LEVEL_MAP: Dict[str, Tuple[int, int]] = {
+    "entry": (0, 2),
+    "junior": (1, 3),
+    "mid": (3, 7),
+    "senior": (5, 12),
+    "lead": (7, 15),
+    "principal": (10, 20),
+    "staff": (8, 20)
+}
+
+# Rows pulled from SQLite per fetchmany() call when streaming candidates
+_FETCH_BATCH_SIZE = 256
+
+# Columns returned for every candidate query (candidates is aliased as c)
+_CANDIDATE_COLUMNS = """
+    c.id, c.source_id, c.name, c.email, c.phone, c.location, c.current_title, 
+    c.current_company, c.experience_years, c.skills, c.education, 
+    c.certifications, c.raw_data, c.created_at, c.updated_at
+"""
+
+# Secondary indexes the query paths below rely on
+_INDEX_SCHEMA = """
+    -- Only served the removed prefix-range location filter
+    DROP INDEX IF EXISTS idx_candidates_location;
+    CREATE INDEX IF NOT EXISTS idx_candidates_status_exp_created ON candidates(status, experience_years DESC, created_at DESC);
+"""
+
+# One row per candidate skill, kept in sync with candidates.skills by triggers
+_SKILLS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS candidate_skills (
+        candidate_id INTEGER NOT NULL,
+        skill TEXT NOT NULL COLLATE NOCASE,
+        position INTEGER NOT NULL,
+        PRIMARY KEY (candidate_id, skill)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_candidate_skills_skill ON candidate_skills(skill, candidate_id);
+    CREATE TRIGGER IF NOT EXISTS candidate_skills_ai AFTER INSERT ON candidates BEGIN
+        INSERT OR IGNORE INTO candidate_skills(candidate_id, skill, position)
+        SELECT new.id, value, key FROM json_each(CASE WHEN json_valid(new.skills) THEN new.skills ELSE '[]' END)
+        WHERE type = 'text';
+    END;
+    CREATE TRIGGER IF NOT EXISTS candidate_skills_ad AFTER DELETE ON candidates BEGIN
+        DELETE FROM candidate_skills WHERE candidate_id = old.id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS candidate_skills_au AFTER UPDATE OF skills ON candidates BEGIN
+        DELETE FROM candidate_skills WHERE candidate_id = old.id;
+        INSERT OR IGNORE INTO candidate_skills(candidate_id, skill, position)
+        SELECT new.id, value, key FROM json_each(CASE WHEN json_valid(new.skills) THEN new.skills ELSE '[]' END)
+        WHERE type = 'text';
+    END;
+    
+    -- Superseded by candidate_skills
+    DROP TRIGGER IF EXISTS candidates_fts_ai;
+    DROP TRIGGER IF EXISTS candidates_fts_ad;
+    DROP TRIGGER IF EXISTS candidates_fts_au;
+    DROP TABLE IF EXISTS candidates_fts;
+"""
+
+# Fill candidate_skills from the JSON column for rows inserted before the table existed
+_SKILLS_BACKFILL = """
+    INSERT OR IGNORE INTO candidate_skills(candidate_id, skill, position)
+    SELECT c.id, j.value, j.key
+    FROM candidates c, json_each(CASE WHEN json_valid(c.skills) THEN c.skills ELSE '[]' END) j
+    WHERE j.type = 'text'
+"""
+
+# Applied to every pooled connection, sync or async
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=10000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    # Refresh planner statistics only if SQLite considers them stale
+    "PRAGMA optimize"
+)
+
+# Notes and the UTC screening time are merged into raw_data in SQL;
+# invalid or missing JSON starts from an empty object
+_STATUS_UPDATE_QUERY = """
+    UPDATE candidates 
+    SET status = :status,
+        updated_at = CURRENT_TIMESTAMP,
+        raw_data = CASE WHEN :notes IS NULL OR :notes = '' THEN raw_data ELSE json_set(
+            CASE WHEN json_valid(raw_data) THEN raw_data ELSE '{}' END,
+            '$.screening_notes', :notes,
+            '$.last_screening', strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+        ) END
+    WHERE source_id = :candidate_id OR id = :candidate_id
+"""
+
+# Totals, experience distribution and top locations in one round-trip,
+# tagged by the first column
+_STATS_QUERY = """
+    SELECT 'total', NULL, COUNT(*) FROM candidates
+    UNION ALL
+    SELECT 'available', NULL, COUNT(*) FROM candidates WHERE status = 'available'
+    UNION ALL
+    SELECT * FROM (
+        SELECT 
+            'experience',
+            CASE 
+                WHEN experience_years <= 2 THEN 'Entry (0-2 years)'
+                WHEN experience_years <= 5 THEN 'Mid (3-5 years)'
+                WHEN experience_years <= 10 THEN 'Senior (6-10 years)'
+                ELSE 'Lead+ (10+ years)'
+            END as exp_level,
+            COUNT(*) as count
+        FROM candidates 
+        WHERE status = 'available'
+        GROUP BY exp_level
+    )
+    UNION ALL
+    SELECT * FROM (
+        SELECT 'location', location, COUNT(*) as count 
+        FROM candidates 
+        WHERE status = 'available' AND location IS NOT NULL
+        GROUP BY location 
+        ORDER BY count DESC 
+        LIMIT 5
+    )
+"""
+
+def _parse_json_column(value, default):
+    """Decode a JSON text column, falling back to default when empty or invalid"""
+    if not value:
+        return default
+    try:
+        return _json_loads(value) if isinstance(value, str) else value
+    except (json.JSONDecodeError, TypeError, ValueError):
+        return default
+
+def _candidate_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    """Map a candidate row to the format expected by screening"""
+    return {
+        'id': str(row['id']),
+        'source_id': str(row['source_id']),
+        'name': row['name'],
+        'email': row['email'],
+        'phone': row['phone'],
+        'location': row['location'],
+        'current_title': row['current_title'],
+        'current_company': row['current_company'],
+        'experience_years': row['experience_years'] or 0,
+        'skills': _parse_json_column(row['skills'], []),
+        'education': _parse_json_column(row['education'], []),
+        'certifications': _parse_json_column(row['certifications'], []),
+        'source': 'database',  # Mark as database source
+        'raw_data': _parse_json_column(row['raw_data'], {}),
+        'created_at': row['created_at'],
+        'updated_at': row['updated_at']
+    }
+
+def _status_update_params(updates: List[Tuple[str, str, Optional[str]]]):
+    """Named parameters for _STATUS_UPDATE_QUERY, one dict per update"""
+    return (
+        {
+            "candidate_id": candidate_id,
+            "status": new_status,
+            "notes": notes
+        }
+        for candidate_id, new_status, notes in updates
+    )
+
+def _stats_from_rows(rows) -> Dict[str, Any]:
+    """Fold the tagged rows of _STATS_QUERY into the stats dict"""
+    stats = {
+        'total_candidates': 0,
+        'available_candidates': 0,
+        'experience_distribution': {},
+        'top_locations': {}
+    }
+    for kind, label, count in rows:
+        if kind == 'total':
+            stats['total_candidates'] = count
+        elif kind == 'available':
+            stats['available_candidates'] = count
+        elif kind == 'experience':
+            stats['experience_distribution'][label] = count
+        else:
+            stats['top_locations'][label] = count
+    return stats
+
+@lru_cache(maxsize=128)
+def _compose_job_query(where_clauses: tuple, relevance_terms: tuple) -> str:
+    """Assemble the job query SQL for one requirement shape"""
+    # Identical shapes yield identical SQL text, so the connection's statement
+    # cache reuses the compiled statement and only parameters are rebound
+    if relevance_terms:
+        select_clause = f"{_CANDIDATE_COLUMNS}, ({' + '.join(relevance_terms)}) AS relevance"
+        order_clause = "ORDER BY relevance DESC, experience_years DESC, created_at DESC"
+    else:
+        select_clause = _CANDIDATE_COLUMNS
+        order_clause = "ORDER BY experience_years DESC, created_at DESC"
+    
+    return f"""
+        SELECT {select_clause}
+        FROM candidates c
+        WHERE {' AND '.join(where_clauses)}
+        {order_clause}
+        LIMIT :max_candidates
+    """
+
+# Available candidates, most experienced first
+_ALL_CANDIDATES_QUERY = _compose_job_query(("status = 'available'",), ())
+
+class ConnectionPool:
+    """Fixed-size pool of pre-configured SQLite connections"""
+    
+    def __init__(self, db_path: str, size: int = 4, timeout: float = 30.0):
+        self.db_path = db_path
+        self.timeout = timeout
+        self._connections = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._connections.put(self._connect())
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection tuned for concurrent reads"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    @contextmanager
+    def acquire(self):
+        """Check a connection out of the pool, replacing it if it has gone bad"""
+        conn = self._connections.get(timeout=self.timeout)
+        try:
+            try:
+                conn.execute("SELECT 1")
+            except sqlite3.Error:
+                conn = self._connect()
+            yield conn
+        finally:
+            # Never hand an open transaction to the next caller
+            if conn.in_transaction:
+                conn.rollback()
+            self._connections.put(conn)
+    
+    def close(self):
+        """Close every idle connection in the pool"""
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except queue.Empty:
+                break
+
 class CandidateDatabase:
     """Database integration for candidate retrieval and management"""
     
-    def __init__(self, db_path: str = "candidates.db"):
+    _default_instance = None
+    _default_lock = threading.Lock()
+    
+    def __init__(self, db_path: str = "candidates.db", pool_size: int = 4):
         self.db_path = db_path
+        self._pool = ConnectionPool(db_path, size=pool_size)
         self.ensure_database_exists()
     
+    @classmethod
+    def get_default(cls) -> "CandidateDatabase":
+        """Shared instance for the default database, created on first use"""
+        with cls._default_lock:
+            if cls._default_instance is None:
+                cls._default_instance = cls()
+            return cls._default_instance
+    
+    def close(self):
+        """Release the pooled connections"""
+        self._pool.close()
+    
+    def analyze(self):
+        """Rebuild planner statistics for the candidate tables after bulk loads"""
+        with self._pool.acquire() as conn:
+            conn.execute("ANALYZE candidates")
+            conn.execute("ANALYZE candidate_skills")
+            conn.commit()
+    
     def ensure_database_exists(self):
         """Ensure the database and table exist"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Check if candidates table exists
-            cursor.execute("""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name='candidates'
-            """)
-            
-            if not cursor.fetchone():
-                print(f"⚠️ Database table 'candidates' not found at {self.db_path}")
-                print(f"💡 Please run database_setup.py first to create and populate the database")
-                return False
-            
-            conn.close()
-            return True
+            with self._pool.acquire() as conn:
+                cursor = conn.cursor()
+                
+                # Check if candidates table exists
+                cursor.execute("""
+                    SELECT name FROM sqlite_master 
+                    WHERE type='table' AND name='candidates'
+                """)
+                
+                if not cursor.fetchone():
+                    print(f"⚠️ Database table 'candidates' not found at {self.db_path}")
+                    print(f"💡 Please run database_setup.py first to create and populate the database")
+                    return False
+                
+                conn.executescript(_INDEX_SCHEMA)
+                
+                # Build the relational skills table the first time this database is opened
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'candidate_skills'")
+                if not cursor.fetchone():
+                    conn.executescript(_SKILLS_SCHEMA)
+                    conn.execute(_SKILLS_BACKFILL)
+                    conn.execute("ANALYZE")
+                    conn.commit()
+                
+                return True
             
         except Exception as e:
             print(f"❌ Database connection error: {e}")
@@ -43,232 +342,16 @@ class CandidateDatabase:
         FIXED VERSION with better filtering logic
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Start with basic filtering - be more permissive initially
-            print(f"🔍 Querying database for candidates...")
-            print(f"   Job requirements: {job_requirements}")
-            
-            # Check if we have any available candidates at all
-            cursor.execute("SELECT COUNT(*) FROM candidates WHERE status = 'available'")
-            available_count = cursor.fetchone()[0]
-            
-            if available_count == 0:
-                print("⚠️ No candidates with 'available' status found")
-                # Try with any status
-                cursor.execute("SELECT COUNT(*) FROM candidates")
-                total_count = cursor.fetchone()[0]
-                print(f"   Total candidates in database: {total_count}")
-                
-                if total_count == 0:
-                    print("❌ Database is empty!")
-                    return []
-                
-                # Check what statuses exist
-                cursor.execute("SELECT DISTINCT status, COUNT(*) FROM candidates GROUP BY status")
-                statuses = cursor.fetchall()
-                print("📋 Available statuses:")
-                for status, count in statuses:
-                    print(f"   • {status}: {count}")
-                
-                # Use all candidates regardless of status
-                base_where = "1=1"  # Always true condition
-                print("🔄 Using all candidates regardless of status...")
-            else:
-                base_where = "status = 'available'"
-                print(f"   ✅ Found {available_count} available candidates")
-            
-            # Build dynamic query with more flexible filtering
-            where_clauses = [base_where]
-            params = []
-            scoring_selects = []  # For relevance scoring
-            
-            # IMPROVED Skills filter - make it more flexible
-            required_skills = job_requirements.get('required_skills', [])
-            if required_skills:
-                print(f"   🎯 Filtering by skills: {required_skills}")
-                
-                # Create individual skill conditions for OR logic
-                skill_conditions = []
-                skill_scores = []
-                
-                for i, skill in enumerate(required_skills):
-                    skill_param = f"skill_{i}"
-                    skill_conditions.append(f"skills LIKE :{skill_param}")
-                    params.append((skill_param, f"%{skill}%"))
-                    
-                    # Add relevance scoring
-                    skill_scores.append(f"CASE WHEN skills LIKE :{skill_param} THEN 1 ELSE 0 END")
-                
-                # Use OR logic for skills (candidate needs at least ONE skill)
-                if skill_conditions:
-                    where_clauses.append(f"({' OR '.join(skill_conditions)})")
-                    # Add skill match score
-                    scoring_selects.append(f"({' + '.join(skill_scores)}) as skill_matches")
-            
-            # IMPROVED Location filter - only apply if remote is not allowed
-            location = job_requirements.get('location', '')
-            allow_remote = job_requirements.get('allow_remote', True)
-            
-            if location and not allow_remote:
-                print(f"   📍 Filtering by location: {location} (remote not allowed)")
-                where_clauses.append("(location LIKE :location OR location LIKE '%remote%')")
-                params.append(('location', f"%{location}%"))
-            elif location:
-                print(f"   📍 Location preference: {location} (remote allowed)")
-                # Add location scoring but don't filter
-                scoring_selects.append(f"CASE WHEN location LIKE :location_pref THEN 1 ELSE 0 END as location_match")
-                params.append(('location_pref', f"%{location}%"))
-            
-            # IMPROVED Experience filter - be more flexible
-            experience_level = job_requirements.get('experience_level', '')
-            if experience_level:
-                exp_range = self._get_experience_range(experience_level)
-                if exp_range:
-                    min_exp, max_exp = exp_range
-                    print(f"   💼 Experience level: {experience_level} ({min_exp}-{max_exp} years)")
-                    
-                    # Instead of hard filtering, prefer candidates in range but include others
-                    # Only hard filter if experience is way too low
-                    if min_exp > 0:
-                        # Allow candidates with at least 50% of minimum experience
-                        flexible_min = max(0, min_exp // 2)
-                        where_clauses.append("experience_years >= :min_exp")
-                        params.append(('min_exp', flexible_min))
-                    
-                    # Add experience scoring
-                    scoring_selects.append(f"""
-                        CASE 
-                            WHEN experience_years BETWEEN :exp_min AND :exp_max THEN 2
-                            WHEN experience_years >= :exp_min THEN 1
-                            ELSE 0 
-                        END as exp_score
-                    """)
-                    params.extend([('exp_min', min_exp), ('exp_max', max_exp)])
+            candidates = list(self.iter_candidates_for_job(job_requirements, max_candidates))
             
-            # Build the query with scoring
-            base_select = """
-                id, source_id, name, email, phone, location, current_title, 
-                current_company, experience_years, skills, education, 
-                certifications, raw_data, created_at, updated_at
-            """
-            
-            if scoring_selects:
-                select_clause = f"{base_select}, {', '.join(scoring_selects)}"
-                order_clause = "ORDER BY " + ", ".join([s.split(" as ")[1] for s in scoring_selects]) + " DESC, experience_years DESC, created_at DESC"
-            else:
-                select_clause = base_select
-                order_clause = "ORDER BY experience_years DESC, created_at DESC"
-            
-            # Build final query
-            query = f"""
-                SELECT {select_clause}
-                FROM candidates 
-                WHERE {' AND '.join(where_clauses)}
-                {order_clause}
-                LIMIT :max_candidates
-            """
-            params.append(('max_candidates', max_candidates))
-            
-            print(f"   📝 Generated query with {len(where_clauses)} conditions")
-            print(f"   🔢 Query parameters: {len(params)} parameters")
-            
-            # Convert named parameters to positional for sqlite3
-            param_dict = dict(params)
-            
-            # Debug: print the actual query
-            if logging.getLogger().isEnabledFor(logging.DEBUG):
-                print(f"   🐛 SQL Query: {query}")
-                print(f"   🐛 Parameters: {param_dict}")
-            
-            cursor.execute(query, param_dict)
-            rows = cursor.fetchall()
-            
-            print(f"   📊 Raw query returned {len(rows)} rows")
-            
-            if len(rows) == 0:
-                print("⚠️ No candidates found with current filters")
-                # Try a simpler query
-                simple_query = f"""
-                    SELECT {base_select}
-                    FROM candidates 
-                    WHERE {base_where}
-                    ORDER BY experience_years DESC, created_at DESC
-                    LIMIT ?
-                """
-                cursor.execute(simple_query, (max_candidates,))
-                rows = cursor.fetchall()
-                print(f"   🔄 Fallback query returned {len(rows)} candidates")
-            
-            # Get column names
-            columns = [desc[0] for desc in cursor.description]
-            
-            # Convert to candidate format expected by screening
-            candidates = []
-            for row in rows:
-                candidate_dict = dict(zip(columns, row))
-                
-                try:
-                    # Parse JSON fields safely
-                    for json_field in ['skills', 'education', 'certifications']:
-                        if json_field in candidate_dict:
-                            value = candidate_dict[json_field]
-                            if value:
-                                try:
-                                    candidate_dict[json_field] = json.loads(value) if isinstance(value, str) else value
-                                except (json.JSONDecodeError, TypeError):
-                                    candidate_dict[json_field] = []
-                            else:
-                                candidate_dict[json_field] = []
-                    
-                    # Parse raw_data
-                    if 'raw_data' in candidate_dict:
-                        value = candidate_dict['raw_data']
-                        if value:
-                            try:
-                                candidate_dict['raw_data'] = json.loads(value) if isinstance(value, str) else value
-                            except (json.JSONDecodeError, TypeError):
-                                candidate_dict['raw_data'] = {}
-                        else:
-                            candidate_dict['raw_data'] = {}
-                    
-                    # Map database fields to screening format
-                    screening_candidate = {
-                        'id': str(candidate_dict['id']),  # Convert to string
-                        'source_id': str(candidate_dict['source_id']),  # Convert to string
-                        'name': candidate_dict.get('name'),
-                        'email': candidate_dict.get('email'),
-                        'phone': candidate_dict.get('phone'),
-                        'location': candidate_dict.get('location'),
-                        'current_title': candidate_dict.get('current_title'),
-                        'current_company': candidate_dict.get('current_company'),
-                        'experience_years': candidate_dict.get('experience_years', 0),
-                        'skills': candidate_dict.get('skills', []),
-                        'education': candidate_dict.get('education', []),
-                        'certifications': candidate_dict.get('certifications', []),
-                        'source': 'database',  # Mark as database source
-                        'raw_data': candidate_dict.get('raw_data', {}),
-                        'created_at': candidate_dict.get('created_at'),
-                        'updated_at': candidate_dict.get('updated_at')
-                    }
-                    
-                    candidates.append(screening_candidate)
-                    
-                except Exception as parse_error:
-                    print(f"   ⚠️ Error parsing candidate {candidate_dict.get('name', 'Unknown')}: {parse_error}")
-                    continue
-            
-            conn.close()
-            
-            print(f"   ✅ Successfully processed {len(candidates)} candidates")
+            logger.debug("   ✅ Successfully processed %d candidates", len(candidates))
             
             # Show sample of found candidates
-            if candidates:
-                print(f"   📋 Sample candidates:")
+            if candidates and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("   📋 Sample candidates:")
                 for i, candidate in enumerate(candidates[:3]):
                     skills_preview = ', '.join(candidate['skills'][:3]) + ('...' if len(candidate['skills']) > 3 else '')
-                    print(f"      {i+1}. {candidate['name']} - {candidate['current_title']} - {candidate['experience_years']}y - [{skills_preview}]")
+                    logger.debug("      %d. %s - %s - %sy - [%s]", i + 1, candidate['name'], candidate['current_title'], candidate['experience_years'], skills_preview)
             
             return candidates
             
@@ -278,78 +361,160 @@ class CandidateDatabase:
             print(f"   💡 Try running the debug script to identify the issue")
             return []
     
-    def _get_experience_range(self, experience_level: str) -> Optional[tuple]:
+    def iter_candidates_for_job(self, job_requirements: Dict[str, Any], 
+                                max_candidates: int = 50) -> Iterator[Dict[str, Any]]:
+        """Stream candidates matching job requirements in screening format"""
+        logger.debug("🔍 Querying database for candidates...")
+        logger.debug("   Job requirements: %s", job_requirements)
+        
+        attempts = self._plan_job_queries(job_requirements, max_candidates)
+        
+        with self._pool.acquire() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            
+            # Stream in batches; only the first batch decides whether to relax the filters
+            for attempt, (query, params) in enumerate(attempts):
+                cursor.execute(query, params)
+                rows = cursor.fetchmany(_FETCH_BATCH_SIZE)
+                logger.debug("   📊 Query %d returned %d rows in its first batch", attempt + 1, len(rows))
+                if rows:
+                    break
+                
+                if attempt == 1 and logger.isEnabledFor(logging.DEBUG):
+                    # Check what statuses exist before widening past 'available'
+                    cursor.execute("SELECT status, COUNT(*) FROM candidates GROUP BY status")
+                    logger.debug("📋 Available statuses:")
+                    for status, count in cursor.fetchall():
+                        logger.debug("   • %s: %s", status, count)
+            else:
+                logger.warning("❌ Database is empty!")
+                return
+            
+            # Build screening dicts straight from sqlite3.Row, one batch at a time
+            while rows:
+                for row in rows:
+                    try:
+                        candidate = _candidate_from_row(row)
+                    except Exception as parse_error:
+                        logger.warning("   ⚠️ Error parsing candidate %s: %s", row['name'] or 'Unknown', parse_error)
+                        continue
+                    yield candidate
+                rows = cursor.fetchmany(_FETCH_BATCH_SIZE)
+    
+    @classmethod
+    def _plan_job_queries(cls, job_requirements: Dict[str, Any], 
+                          max_candidates: int) -> List[Tuple[str, Dict[str, Any]]]:
+        """Build the job query and its fallbacks as (sql, params) pairs"""
+        # Filter on availability directly; relaxed only if nothing matches below
+        base_where = "status = 'available'"
+        
+        # Build dynamic query with more flexible filtering
+        where_clauses = [base_where]
+        params = []
+        # Weighted parts of one relevance score; skills (x10) outrank location (x3),
+        # which outranks experience (0-2), matching the old per-column ordering
+        relevance_terms = []
+        
+        # IMPROVED Skills filter - make it more flexible
+        required_skills = job_requirements.get('required_skills', [])
+        if required_skills:
+            logger.debug("   🎯 Filtering by skills: %s", required_skills)
+            
+            # Substring match against each stored skill, as the original LIKE '%skill%' did
+            skill_conditions = []
+            skill_scores = []
+            for i, skill in enumerate(required_skills):
+                skill_param = f"skill_{i}"
+                skill_conditions.append(f"cs.skill LIKE :{skill_param}")
+                skill_scores.append(
+                    "EXISTS (SELECT 1 FROM candidate_skills cs "
+                    f"WHERE cs.candidate_id = c.id AND cs.skill LIKE :{skill_param})"
+                )
+                params.append((skill_param, f"%{skill}%"))
+            
+            # Use OR logic for skills (candidate needs at least ONE skill)
+            where_clauses.append(
+                "EXISTS (SELECT 1 FROM candidate_skills cs "
+                f"WHERE cs.candidate_id = c.id AND ({' OR '.join(skill_conditions)}))"
+            )
+            # Add skill match score: the number of required skills matched
+            relevance_terms.append(f"({' + '.join(skill_scores)}) * 10")
+        
+        # IMPROVED Location filter - only apply if remote is not allowed
+        location = job_requirements.get('location', '')
+        allow_remote = job_requirements.get('allow_remote', True)
+        
+        if location and not allow_remote:
+            logger.debug("   📍 Filtering by location: %s (remote not allowed)", location)
+            where_clauses.append("(location LIKE :location OR location LIKE '%remote%')")
+            params.append(('location', f"%{location}%"))
+        elif location:
+            logger.debug("   📍 Location preference: %s (remote allowed)", location)
+            # Add location scoring but don't filter
+            relevance_terms.append("(CASE WHEN location LIKE :location_pref THEN 1 ELSE 0 END) * 3")
+            params.append(('location_pref', f"%{location}%"))
+        
+        # IMPROVED Experience filter - be more flexible
+        experience_level = job_requirements.get('experience_level', '')
+        if experience_level:
+            exp_range = cls._get_experience_range(experience_level)
+            if exp_range:
+                min_exp, max_exp = exp_range
+                logger.debug("   💼 Experience level: %s (%s-%s years)", experience_level, min_exp, max_exp)
+                
+                # Instead of hard filtering, prefer candidates in range but include others
+                # Only hard filter if experience is way too low
+                if min_exp > 0:
+                    # Allow candidates with at least 50% of minimum experience
+                    where_clauses.append("experience_years >= MAX(0, :exp_min / 2)")
+                
+                # Add experience scoring
+                relevance_terms.append(
+                    "CASE WHEN experience_years BETWEEN :exp_min AND :exp_max THEN 2"
+                    " WHEN experience_years >= :exp_min THEN 1 ELSE 0 END"
+                )
+                params.extend([('exp_min', min_exp), ('exp_max', max_exp)])
+        
+        # Build the query with scoring (cached per requirement shape)
+        query = _compose_job_query(tuple(where_clauses), tuple(relevance_terms))
+        params.append(('max_candidates', max_candidates))
+        
+        # Convert named parameters to positional for sqlite3
+        param_dict = dict(params)
+        
+        logger.debug("   📝 Generated query with %d conditions", len(where_clauses))
+        logger.debug("   🐛 SQL Query: %s", query)
+        logger.debug("   🐛 Parameters: %s", param_dict)
+        
+        # Looser fallbacks, tried in order only while the previous query matched nothing
+        limit_only = {'max_candidates': max_candidates}
+        return [
+            (query, param_dict),
+            (_compose_job_query((base_where,), ()), limit_only),
+            (_compose_job_query(("1=1",) + tuple(where_clauses[1:]), tuple(relevance_terms)), param_dict),
+            (_compose_job_query(("1=1",), ()), limit_only)
+        ]
+    
+    @staticmethod
+    def _get_experience_range(experience_level: str) -> Optional[Tuple[int, int]]:
         """Convert experience level to years range"""
-        level_map = {
-            "entry": (0, 2),
-            "junior": (1, 3),
-            "mid": (3, 7),
-            "senior": (5, 12),
-            "lead": (7, 15),
-            "principal": (10, 20),
-            "staff": (8, 20)
-        }
-        return level_map.get(experience_level.lower(), None)
+        return _LEVEL_MAP.get(experience_level.casefold())
     
     def get_all_candidates(self, max_candidates: int = 100) -> List[Dict[str, Any]]:
         """Get all available candidates from database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            query = """
-                SELECT id, source_id, name, email, phone, location, current_title, 
-                        current_company, experience_years, skills, education, 
-                        certifications, raw_data, created_at, updated_at
-                FROM candidates 
-                WHERE status = 'available'
-                ORDER BY experience_years DESC, created_at DESC
-                LIMIT ?
-            """
-            
-            cursor.execute(query, (max_candidates,))
-            rows = cursor.fetchall()
-            
-            columns = [desc[0] for desc in cursor.description]
-            candidates = []
-            
-            for row in rows:
-                candidate_dict = dict(zip(columns, row))
+            with self._pool.acquire() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
                 
-                # Parse JSON fields safely
-                for json_field in ['skills', 'education', 'certifications', 'raw_data']:
-                    try:
-                        if candidate_dict[json_field]:
-                            candidate_dict[json_field] = json.loads(candidate_dict[json_field])
-                        else:
-                            candidate_dict[json_field] = [] if json_field != 'raw_data' else {}
-                    except (json.JSONDecodeError, TypeError):
-                        candidate_dict[json_field] = [] if json_field != 'raw_data' else {}
+                cursor.execute(_ALL_CANDIDATES_QUERY, {'max_candidates': max_candidates})
                 
-                # Format for screening
-                screening_candidate = {
-                    'id': str(candidate_dict['id']),  # Convert to string
-                    'source_id': str(candidate_dict['source_id']),  # Convert to string
-                    'name': candidate_dict['name'],
-                    'email': candidate_dict['email'],
-                    'phone': candidate_dict['phone'],
-                    'location': candidate_dict['location'],
-                    'current_title': candidate_dict['current_title'],
-                    'current_company': candidate_dict['current_company'],
-                    'experience_years': candidate_dict['experience_years'],
-                    'skills': candidate_dict['skills'],
-                    'education': candidate_dict['education'],
-                    'certifications': candidate_dict['certifications'],
-                    'source': 'database',
-                    'raw_data': candidate_dict['raw_data'],
-                    'created_at': candidate_dict['created_at'],
-                    'updated_at': candidate_dict['updated_at']
-                }
+                candidates = []
+                for rows in iter(lambda: cursor.fetchmany(_FETCH_BATCH_SIZE), []):
+                    candidates.extend(_candidate_from_row(row) for row in rows)
                 
-                candidates.append(screening_candidate)
-            
-            conn.close()
-            return candidates
+                return candidates
             
         except Exception as e:
             logging.error(f"Error fetching all candidates: {e}", exc_info=True)
@@ -358,43 +523,17 @@ class CandidateDatabase:
     
     def update_candidate_status(self, candidate_id: str, new_status: str, notes: str = None):
         """Update candidate status after screening"""
+        self.update_candidate_statuses([(candidate_id, new_status, notes)])
+    
+    def update_candidate_statuses(self, updates: List[Tuple[str, str, Optional[str]]]):
+        """Apply (candidate_id, new_status, notes) updates in a single transaction"""
+        if not updates:
+            return
+        
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Update status and timestamp
-            update_query = """
-                UPDATE candidates 
-                SET status = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE source_id = ? OR id = ?
-            """
-            
-            cursor.execute(update_query, (new_status, candidate_id, candidate_id))
-            
-            # Add notes to raw_data if provided
-            if notes:
-                cursor.execute("SELECT raw_data FROM candidates WHERE source_id = ? OR id = ?", 
-                                (candidate_id, candidate_id))
-                row = cursor.fetchone()
-                if row and row[0]:
-                    try:
-                        raw_data = json.loads(row[0])
-                    except:
-                        raw_data = {}
-                else:
-                    raw_data = {}
-                
-                raw_data['screening_notes'] = notes
-                raw_data['last_screening'] = datetime.now().isoformat()
-                
-                cursor.execute("""
-                    UPDATE candidates 
-                    SET raw_data = ? 
-                    WHERE source_id = ? OR id = ?
-                """, (json.dumps(raw_data), candidate_id, candidate_id))
-            
-            conn.commit()
-            conn.close()
+            with self._pool.acquire() as conn:
+                with conn:
+                    conn.executemany(_STATUS_UPDATE_QUERY, _status_update_params(updates))
             
         except Exception as e:
             logging.error(f"Error updating candidate status: {e}", exc_info=True)
@@ -402,58 +541,114 @@ class CandidateDatabase:
     def get_database_stats(self) -> Dict[str, Any]:
         """Get database statistics"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            stats = {}
+            with self._pool.acquire() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute(_STATS_QUERY)
+                stats = _stats_from_rows(cursor.fetchall())
+                
+                return stats
             
-            # Total candidates
-            cursor.execute("SELECT COUNT(*) FROM candidates")
-            stats['total_candidates'] = cursor.fetchone()[0]
+        except Exception as e:
+            logging.error(f"Error getting database stats: {e}", exc_info=True)
+            return {}
+
+class AsyncCandidateDatabase:
+    """Non-blocking candidate access for async callers, backed by aiosqlitepool"""
+    
+    def __init__(self, db_path: str = "candidates.db", pool_size: int = 4):
+        if SQLiteConnectionPool is None:
+            raise ImportError("AsyncCandidateDatabase requires the aiosqlite and aiosqlitepool packages")
+        
+        # Schema, indexes and the skills table are set up by CandidateDatabase
+        self.db_path = db_path
+        self._pool = SQLiteConnectionPool(connection_factory=self._connect, pool_size=pool_size)
+    
+    async def _connect(self):
+        """Open an aiosqlite connection with the same pragmas as the sync pool"""
+        conn = await aiosqlite.connect(self.db_path, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            await conn.execute(pragma)
+        return conn
+    
+    async def close(self):
+        """Close every pooled connection"""
+        await self._pool.close()
+    
+    async def get_candidates_for_job(self, job_requirements: Dict[str, Any], 
+                                     max_candidates: int = 50) -> List[Dict[str, Any]]:
+        """Retrieve candidates for a job, relaxing filters like the sync version"""
+        try:
+            async with self._pool.connection() as conn:
+                for query, params in CandidateDatabase._plan_job_queries(job_requirements, max_candidates):
+                    async with conn.execute(query, params) as cursor:
+                        rows = await cursor.fetchall()
+                    if rows:
+                        break
             
-            # Available candidates
-            cursor.execute("SELECT COUNT(*) FROM candidates WHERE status = 'available'")
-            stats['available_candidates'] = cursor.fetchone()[0]
+            candidates = []
+            for row in rows:
+                try:
+                    candidates.append(_candidate_from_row(row))
+                except Exception as parse_error:
+                    logger.warning("   ⚠️ Error parsing candidate %s: %s", row['name'] or 'Unknown', parse_error)
+            return candidates
             
-            # Experience distribution
-            cursor.execute("""
-                SELECT 
-                    CASE 
-                        WHEN experience_years <= 2 THEN 'Entry (0-2 years)'
-                        WHEN experience_years <= 5 THEN 'Mid (3-5 years)'
-                        WHEN experience_years <= 10 THEN 'Senior (6-10 years)'
-                        ELSE 'Lead+ (10+ years)'
-                    END as exp_level,
-                    COUNT(*) as count
-                FROM candidates 
-                WHERE status = 'available'
-                GROUP BY exp_level
-            """)
-            stats['experience_distribution'] = dict(cursor.fetchall())
+        except Exception as e:
+            logging.error(f"Database query error: {e}", exc_info=True)
+            return []
+    
+    async def get_all_candidates(self, max_candidates: int = 100) -> List[Dict[str, Any]]:
+        """Get all available candidates from database"""
+        try:
+            async with self._pool.connection() as conn:
+                async with conn.execute(_ALL_CANDIDATES_QUERY, {'max_candidates': max_candidates}) as cursor:
+                    rows = await cursor.fetchall()
+            return [_candidate_from_row(row) for row in rows]
             
-            # Top locations
-            cursor.execute("""
-                SELECT location, COUNT(*) as count 
-                FROM candidates 
-                WHERE status = 'available' AND location IS NOT NULL
-                GROUP BY location 
-                ORDER BY count DESC 
-                LIMIT 5
-            """)
-            stats['top_locations'] = dict(cursor.fetchall())
+        except Exception as e:
+            logging.error(f"Error fetching all candidates: {e}", exc_info=True)
+            return []
+    
+    async def update_candidate_status(self, candidate_id: str, new_status: str, notes: str = None):
+        """Update candidate status after screening"""
+        await self.update_candidate_statuses([(candidate_id, new_status, notes)])
+    
+    async def update_candidate_statuses(self, updates: List[Tuple[str, str, Optional[str]]]):
+        """Apply (candidate_id, new_status, notes) updates in a single transaction"""
+        if not updates:
+            return
+        
+        try:
+            async with self._pool.connection() as conn:
+                try:
+                    await conn.executemany(_STATUS_UPDATE_QUERY, list(_status_update_params(updates)))
+                    await conn.commit()
+                except Exception:
+                    await conn.rollback()
+                    raise
             
-            conn.close()
-            return stats
+        except Exception as e:
+            logging.error(f"Error updating candidate status: {e}", exc_info=True)
+    
+    async def get_database_stats(self) -> Dict[str, Any]:
+        """Get database statistics"""
+        try:
+            async with self._pool.connection() as conn:
+                async with conn.execute(_STATS_QUERY) as cursor:
+                    return _stats_from_rows(await cursor.fetchall())
             
         except Exception as e:
             logging.error(f"Error getting database stats: {e}", exc_info=True)
             return {}
 
-def test_database_connection():
+def test_database_connection(db: Optional[CandidateDatabase] = None):
     """Test database connection and data retrieval"""
     print("🧪 Testing Database Connection...")
     
-    db = CandidateDatabase()
+    if db is None:
+        db = CandidateDatabase.get_default()
     
     # Test basic connection
     if not db.ensure_database_exists():
@@ -485,13 +680,12 @@ def test_database_connection():
 
 if __name__ == "__main__":
     # Test the database integration
-    success = test_database_connection()
+    db = CandidateDatabase.get_default()
+    success = test_database_connection(db)
     
     if success:
         print(f"\n🔍 Testing candidate retrieval...")
         
-        db = CandidateDatabase()
-        
         # Test getting candidates for a specific job
         job_requirements = {
             'required_skills': ['Python', 'Machine Learning'],
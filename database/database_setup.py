@@ -2,20 +2,175 @@ import sqlite3
 import json
 from datetime import datetime, timedelta
 import random
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
 import os
+import threading
+from functools import lru_cache
+from itertools import islice
+
+try:
+    import orjson
+    
+    _json_loads = orjson.loads
+    
+    def _json_dumps(value) -> str:
+        return orjson.dumps(value).decode()
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+# Years-of-experience range for each experience level
+_LEVEL_MAP = {
+    "entry": (0, 2),
+    "junior": (1, 3),
+    "mid": (3, 7),
+    "senior": (5, 12),
+    "lead": (7, 15),
+    "principal": (10, 20),
+    "staff": (8, 20)
+}
+
+# Bulk insert statement; rows are appended as VALUES groups
+_INSERT_CANDIDATES = """
+    INSERT OR IGNORE INTO candidates 
+    (source_id, name, email, phone, location, current_title, current_company,
+     experience_years, skills, education, certifications, linkedin_url, 
+     resume_url, status, raw_data)
+    VALUES """
+_CANDIDATE_ROW_VALUES = "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+# Secondary indexes on candidates, by name
+_CANDIDATE_INDEXES = {
+    "idx_location": "candidates(location)",
+    # Same definition and name as database_integration, so the two modules share one index
+    "idx_candidates_status_exp_created": "candidates(status, experience_years DESC, created_at DESC)"
+}
+
+# Normalized skills, kept in sync with candidates.skills by triggers; same layout
+# as database_integration, which reads this table when screening
+_SKILLS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS candidate_skills (
+        candidate_id INTEGER NOT NULL,
+        skill TEXT NOT NULL COLLATE NOCASE,
+        position INTEGER NOT NULL,
+        PRIMARY KEY (candidate_id, skill)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_candidate_skills_skill ON candidate_skills(skill, candidate_id);
+    CREATE TRIGGER IF NOT EXISTS candidate_skills_ai AFTER INSERT ON candidates BEGIN
+        INSERT OR IGNORE INTO candidate_skills(candidate_id, skill, position)
+        SELECT new.id, value, key FROM json_each(CASE WHEN json_valid(new.skills) THEN new.skills ELSE '[]' END)
+        WHERE type = 'text';
+    END;
+    CREATE TRIGGER IF NOT EXISTS candidate_skills_ad AFTER DELETE ON candidates BEGIN
+        DELETE FROM candidate_skills WHERE candidate_id = old.id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS candidate_skills_au AFTER UPDATE OF skills ON candidates BEGIN
+        DELETE FROM candidate_skills WHERE candidate_id = old.id;
+        INSERT OR IGNORE INTO candidate_skills(candidate_id, skill, position)
+        SELECT new.id, value, key FROM json_each(CASE WHEN json_valid(new.skills) THEN new.skills ELSE '[]' END)
+        WHERE type = 'text';
+    END;
+"""
+
+# Fills candidate_skills for rows inserted before the table existed
+_SKILLS_BACKFILL = """
+    INSERT OR IGNORE INTO candidate_skills(candidate_id, skill, position)
+    SELECT c.id, j.value, j.key
+    FROM candidates c, json_each(CASE WHEN json_valid(c.skills) THEN c.skills ELSE '[]' END) j
+    WHERE j.type = 'text'
+"""
+
+class CandidateRow(dict):
+    """Candidate dict whose JSON columns are decoded on first access"""
+    
+    _JSON_DEFAULTS = {'skills': list, 'education': list, 'certifications': list, 'raw_data': dict}
+    
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if key in self._JSON_DEFAULTS and (value is None or isinstance(value, str)):
+            value = _json_loads(value) if value else self._JSON_DEFAULTS[key]()
+            dict.__setitem__(self, key, value)
+        return value
+    
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+    
+    # Overriding __iter__ and keys takes dict(row) and {**row} off CPython's
+    # raw-storage fast path, so copies read every value through __getitem__
+    def __iter__(self):
+        return iter(dict.keys(self))
+    
+    def keys(self):
+        return dict.keys(self)
+    
+    def _decode_all(self):
+        """Decode any JSON columns not yet accessed"""
+        for key in self._JSON_DEFAULTS:
+            if key in self:
+                self[key]
+    
+    def items(self):
+        self._decode_all()
+        return dict.items(self)
+    
+    def values(self):
+        self._decode_all()
+        return dict.values(self)
+    
+    def copy(self):
+        self._decode_all()
+        return dict(self)
 
 class CandidateDatabase:
     """Database manager for candidate storage and retrieval"""
     
     def __init__(self, db_path: str = "candidates.db"):
         self.db_path = db_path
+        self._tls = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
         self.init_database()
     
+    def _conn(self) -> sqlite3.Connection:
+        """Connection owned by the calling thread, opened on first use"""
+        conn = getattr(self._tls, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._tls.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    def close(self):
+        """Close every thread's connection"""
+        lock = getattr(self, "_connections_lock", None)
+        if lock is None:
+            return
+        with lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._tls = threading.local()
+    
+    def __del__(self):
+        self.close()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with WAL journaling and tuned cache settings"""
+        # Connections are used only by their owning thread; close() may run elsewhere.
+        # The larger statement cache keeps every search/stats variant prepared
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.row_factory = sqlite3.Row
+        return conn
+    
     def init_database(self):
         """Initialize the database with candidate table"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn().cursor()
         
         # Create candidates table
         cursor.execute("""
@@ -42,127 +197,117 @@ class CandidateDatabase:
         """)
         
         # Create index on commonly queried fields
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_skills ON candidates(skills)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_location ON candidates(location)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_experience ON candidates(experience_years)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_status ON candidates(status)")
-        
-        conn.commit()
-        conn.close()
+        # Skills are matched through candidate_skills, so an index on the raw JSON text is never used
+        cursor.execute("DROP INDEX IF EXISTS idx_skills")
+        # Status and experience lookups are served by the compound search index
+        cursor.execute("DROP INDEX IF EXISTS idx_status")
+        cursor.execute("DROP INDEX IF EXISTS idx_experience")
+        for name, definition in _CANDIDATE_INDEXES.items():
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+        
+        # Skills child table; inserts into candidates populate it through triggers
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'candidate_skills'")
+        skills_table_exists = cursor.fetchone() is not None
+        cursor.executescript(_SKILLS_SCHEMA)
+        if not skills_table_exists:
+            cursor.execute(_SKILLS_BACKFILL)
+        
+        self._conn().commit()
         print(f"✅ Database initialized: {self.db_path}")
     
     def populate_sample_data(self):
         """Populate database with sample candidate data"""
-        sample_candidates = self._generate_sample_candidates()
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        for candidate in sample_candidates:
-            try:
-                cursor.execute("""
-                    INSERT OR REPLACE INTO candidates 
-                    (source_id, name, email, phone, location, current_title, current_company,
-                     experience_years, skills, education, certifications, linkedin_url, 
-                     resume_url, status, raw_data)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    candidate['source_id'],
-                    candidate['name'],
-                    candidate['email'],
-                    candidate['phone'],
-                    candidate['location'],
-                    candidate['current_title'],
-                    candidate['current_company'],
-                    candidate['experience_years'],
-                    json.dumps(candidate['skills']),
-                    json.dumps(candidate['education']),
-                    json.dumps(candidate['certifications']),
-                    candidate['linkedin_url'],
-                    candidate['resume_url'],
-                    candidate['status'],
-                    json.dumps(candidate['raw_data'])
-                ))
-            except sqlite3.IntegrityError as e:
-                print(f"⚠️ Skipping duplicate candidate: {candidate['email']} - {e}")
-        
-        conn.commit()
+        cursor = self._conn().cursor()
+        
+        # One transaction for the whole batch, so SQLite syncs once at commit; secondary
+        # indexes are dropped for the load and rebuilt once at the end. Duplicate source_id
+        # or email rows are skipped (their UNIQUE indexes stay in place)
+        with self._conn():
+            for name in _CANDIDATE_INDEXES:
+                cursor.execute(f"DROP INDEX IF EXISTS {name}")
+            
+            self._chunked_insert(cursor, self._iter_sample_candidate_rows())
+            
+            for name, definition in _CANDIDATE_INDEXES.items():
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+        
         count = cursor.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
-        conn.close()
         
         print(f"✅ Database populated with {count} candidates")
         return count
     
+    def _chunked_insert(self, cursor: sqlite3.Cursor, rows: Iterable[tuple], chunk_size: int = 500):
+        """Insert candidate rows with one multi-row VALUES statement per full chunk"""
+        chunk_query = _INSERT_CANDIDATES + ", ".join([_CANDIDATE_ROW_VALUES] * chunk_size)
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if len(chunk) < chunk_size:
+                break
+            cursor.execute(chunk_query, [value for row in chunk for value in row])
+        
+        # Remainder smaller than a chunk
+        if chunk:
+            cursor.executemany(_INSERT_CANDIDATES + _CANDIDATE_ROW_VALUES, chunk)
+    
     def search_candidates(self, skills: List[str] = None, location: str = None, 
-                         experience_level: str = None, max_results: int = 50) -> List[Dict[str, Any]]:
-        """Search candidates based on criteria"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+                         experience_level: str = None, max_results: int = 50) -> Iterator[Dict[str, Any]]:
+        """Search candidates based on criteria, yielding matches as SQLite produces them"""
+        cursor = self._conn().cursor()
         
-        # Build dynamic query
-        where_clauses = ["status = 'available'"]
+        # Bind parameters in the order _build_query lays out its conditions
         params = []
         
         if skills:
-            # Search for any of the required skills
-            skill_conditions = []
-            for skill in skills:
-                skill_conditions.append("skills LIKE ?")
-                params.append(f"%{skill}%")
-            where_clauses.append(f"({' OR '.join(skill_conditions)})")
+            params.extend(f"%{skill}%" for skill in skills)
         
         if location:
-            where_clauses.append("location LIKE ?")
             params.append(f"%{location}%")
         
-        if experience_level:
-            exp_range = self._get_experience_range(experience_level)
-            if exp_range:
-                where_clauses.append("experience_years BETWEEN ? AND ?")
-                params.extend(exp_range)
+        exp_range = self._get_experience_range(experience_level) if experience_level else None
+        if exp_range:
+            params.extend(exp_range)
         
-        query = f"""
-            SELECT * FROM candidates 
-            WHERE {' AND '.join(where_clauses)}
-            ORDER BY experience_years DESC, created_at DESC
-            LIMIT ?
-        """
+        query = self._build_query(len(skills) if skills else 0, bool(location), exp_range is not None)
         params.append(max_results)
         
         cursor.execute(query, params)
-        rows = cursor.fetchall()
         
-        # Convert to dictionaries
-        columns = [desc[0] for desc in cursor.description]
-        candidates = []
+        for row in cursor:
+            # JSON fields are parsed on first access
+            yield CandidateRow(row)
+    
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _build_query(skill_count: int, has_location: bool, has_experience: bool) -> str:
+        """Build the search SQL for one criteria shape, cached so the statement text is reused"""
+        where_clauses = ["status = 'available'"]
+        
+        if skill_count:
+            # Search for any of the required skills, matching substrings of each stored skill
+            skill_conditions = ' OR '.join(['skill LIKE ?'] * skill_count)
+            where_clauses.append(f"id IN (SELECT candidate_id FROM candidate_skills WHERE {skill_conditions})")
+        
+        if has_location:
+            where_clauses.append("location LIKE ?")
         
-        for row in rows:
-            candidate = dict(zip(columns, row))
-            # Parse JSON fields
-            candidate['skills'] = json.loads(candidate['skills']) if candidate['skills'] else []
-            candidate['education'] = json.loads(candidate['education']) if candidate['education'] else []
-            candidate['certifications'] = json.loads(candidate['certifications']) if candidate['certifications'] else []
-            candidate['raw_data'] = json.loads(candidate['raw_data']) if candidate['raw_data'] else {}
-            candidates.append(candidate)
+        if has_experience:
+            where_clauses.append("experience_years BETWEEN ? AND ?")
         
-        conn.close()
-        return candidates
+        return f"""
+            SELECT * FROM candidates 
+            WHERE {' AND '.join(where_clauses)}
+            ORDER BY experience_years DESC, created_at DESC
+            LIMIT ?
+        """
     
-    def _get_experience_range(self, experience_level: str) -> tuple:
+    @staticmethod
+    def _get_experience_range(experience_level: str) -> tuple:
         """Convert experience level to years range"""
-        level_map = {
-            "entry": (0, 2),
-            "junior": (1, 3),
-            "mid": (3, 7),
-            "senior": (5, 12),
-            "lead": (7, 15),
-            "principal": (10, 20),
-            "staff": (8, 20)
-        }
-        return level_map.get(experience_level.lower(), None)
+        return _LEVEL_MAP.get(experience_level.lower() if experience_level else '')
     
-    def _generate_sample_candidates(self) -> List[Dict[str, Any]]:
-        """Generate realistic sample candidate data"""
+    def _iter_sample_candidate_rows(self) -> Iterator[tuple]:
+        """Generate realistic sample candidate rows in insert column order"""
         
         # Common tech skills
         tech_skills = [
@@ -214,11 +359,33 @@ class CandidateDatabase:
             "MS Artificial Intelligence", "PhD Machine Learning", "BS Software Engineering"
         ]
         
-        candidates = []
-        
-        for i in range(100):  # Generate 100 sample candidates
+        first_names = ["Alex", "Jordan", "Taylor", "Casey", "Morgan", "Riley", "Avery", "Jamie", "Quinn", "Sage"]
+        last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez"]
+        
+        # Draw every per-candidate random value in batches up front
+        count = 100  # Generate 100 sample candidates
+        exp_years_all = random.choices(range(0, 16), k=count)
+        first_name_all = random.choices(first_names, k=count)
+        last_name_all = random.choices(last_names, k=count)
+        skill_count_all = random.choices(range(3, 9), k=count)
+        location_all = random.choices(locations, k=count)
+        company_all = random.choices(companies, k=count)
+        degree_all = random.choices(degrees, k=count)
+        university_all = random.choices(universities, k=count)
+        cert_count_all = random.choices(range(0, 3), k=count)
+        phone_area_all = random.choices(range(200, 1000), k=count)
+        phone_prefix_all = random.choices(range(100, 1000), k=count)
+        phone_line_all = random.choices(range(1000, 10000), k=count)
+        salary_all = random.choices(range(80000, 300001), k=count)
+        relocate_all = random.choices([True, False], k=count)
+        remote_all = random.choices(["remote", "hybrid", "office"], k=count)
+        notice_all = random.choices(["immediate", "2 weeks", "1 month"], k=count)
+        inactive_days_all = random.choices(range(1, 31), k=count)
+        now = datetime.now()
+        
+        for i in range(count):
             # Determine experience level
-            exp_years = random.randint(0, 15)
+            exp_years = exp_years_all[i]
             if exp_years <= 2:
                 level = "junior"
             elif exp_years <= 4:
@@ -231,81 +398,69 @@ class CandidateDatabase:
                 level = "principal"
             
             # Generate candidate
-            first_names = ["Alex", "Jordan", "Taylor", "Casey", "Morgan", "Riley", "Avery", "Jamie", "Quinn", "Sage"]
-            last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez"]
-            
-            first_name = random.choice(first_names)
-            last_name = random.choice(last_names)
+            first_name = first_name_all[i]
+            last_name = last_name_all[i]
             name = f"{first_name} {last_name}"
             
             # Select skills (3-8 skills per candidate)
-            candidate_skills = random.sample(tech_skills, random.randint(3, 8))
+            candidate_skills = random.sample(tech_skills, skill_count_all[i])
             
             # Add level-appropriate skills
             if level in ["senior", "lead", "principal"]:
                 candidate_skills.extend(random.sample(["System Design", "Architecture", "Mentoring", "Leadership"], 2))
             
-            candidate = {
-                "source_id": f"db_{i:03d}",
-                "name": name,
-                "email": f"{first_name.lower()}.{last_name.lower()}@email.com",
-                "phone": f"+1-{random.randint(200, 999)}-{random.randint(100, 999)}-{random.randint(1000, 9999)}",
-                "location": random.choice(locations),
-                "current_title": random.choice(titles_by_level[level]),
-                "current_company": random.choice(companies),
-                "experience_years": exp_years,
-                "skills": candidate_skills,
-                "education": [f"{random.choice(degrees)} - {random.choice(universities)}"],
-                "certifications": random.sample(["AWS Certified", "Google Cloud Certified", "Azure Certified", "Kubernetes Certified"], random.randint(0, 2)),
-                "linkedin_url": f"https://linkedin.com/in/{first_name.lower()}-{last_name.lower()}",
-                "resume_url": f"https://storage.company.com/resumes/{first_name.lower()}_{last_name.lower()}_resume.pdf",
-                "status": "available",
-                "raw_data": {
-                    "preferred_salary": random.randint(80000, 300000),
-                    "willing_to_relocate": random.choice([True, False]),
-                    "remote_preference": random.choice(["remote", "hybrid", "office"]),
-                    "notice_period": random.choice(["immediate", "2 weeks", "1 month"]),
-                    "last_active": (datetime.now() - timedelta(days=random.randint(1, 30))).isoformat()
-                }
-            }
-            
-            candidates.append(candidate)
-        
-        return candidates
+            yield (
+                f"db_{i:03d}",
+                name,
+                f"{first_name.lower()}.{last_name.lower()}@email.com",
+                f"+1-{phone_area_all[i]}-{phone_prefix_all[i]}-{phone_line_all[i]}",
+                location_all[i],
+                random.choice(titles_by_level[level]),
+                company_all[i],
+                exp_years,
+                _json_dumps(candidate_skills),
+                _json_dumps([f"{degree_all[i]} - {university_all[i]}"]),
+                _json_dumps(random.sample(["AWS Certified", "Google Cloud Certified", "Azure Certified", "Kubernetes Certified"], cert_count_all[i])),
+                f"https://linkedin.com/in/{first_name.lower()}-{last_name.lower()}",
+                f"https://storage.company.com/resumes/{first_name.lower()}_{last_name.lower()}_resume.pdf",
+                "available",
+                _json_dumps({
+                    "preferred_salary": salary_all[i],
+                    "willing_to_relocate": relocate_all[i],
+                    "remote_preference": remote_all[i],
+                    "notice_period": notice_all[i],
+                    "last_active": (now - timedelta(days=inactive_days_all[i])).isoformat()
+                })
+            )
     
     def get_stats(self) -> Dict[str, Any]:
         """Get database statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn().cursor()
         
         stats = {}
         
         # Total candidates
         stats['total_candidates'] = cursor.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
         
-        # By experience level
-        stats['by_experience'] = {}
-        for level, (min_exp, max_exp) in [("Entry", (0, 2)), ("Mid", (3, 7)), ("Senior", (5, 12)), ("Lead+", (8, 20))]:
-            count = cursor.execute("SELECT COUNT(*) FROM candidates WHERE experience_years BETWEEN ? AND ?", (min_exp, max_exp)).fetchone()[0]
-            stats['by_experience'][level] = count
+        # By experience level (ranges overlap), counted in a single pass
+        entry, mid, senior, lead = cursor.execute("""
+            SELECT 
+                COALESCE(SUM(CASE WHEN experience_years BETWEEN 0 AND 2 THEN 1 ELSE 0 END), 0),
+                COALESCE(SUM(CASE WHEN experience_years BETWEEN 3 AND 7 THEN 1 ELSE 0 END), 0),
+                COALESCE(SUM(CASE WHEN experience_years BETWEEN 5 AND 12 THEN 1 ELSE 0 END), 0),
+                COALESCE(SUM(CASE WHEN experience_years BETWEEN 8 AND 20 THEN 1 ELSE 0 END), 0)
+            FROM candidates
+        """).fetchone()
+        stats['by_experience'] = {"Entry": entry, "Mid": mid, "Senior": senior, "Lead+": lead}
         
         # Top locations
         cursor.execute("SELECT location, COUNT(*) as count FROM candidates GROUP BY location ORDER BY count DESC LIMIT 5")
         stats['top_locations'] = dict(cursor.fetchall())
         
-        # Top skills (approximate, since skills are stored as JSON)
-        cursor.execute("SELECT skills FROM candidates")
-        all_skills = []
-        for (skills_json,) in cursor.fetchall():
-            if skills_json:
-                skills = json.loads(skills_json)
-                all_skills.extend(skills)
-        
-        from collections import Counter
-        skill_counts = Counter(all_skills)
-        stats['top_skills'] = dict(skill_counts.most_common(10))
+        # Top skills
+        cursor.execute("SELECT skill, COUNT(*) FROM candidate_skills GROUP BY skill ORDER BY 2 DESC LIMIT 10")
+        stats['top_skills'] = dict(cursor.fetchall())
         
-        conn.close()
         return stats
 
 def setup_database():
@@ -341,11 +496,13 @@ def setup_database():
     
     return db
 
-def test_database_search():
+def test_database_search(db: CandidateDatabase = None):
     """Test database search functionality"""
     print(f"\n🧪 Testing Database Search...")
     
-    db = CandidateDatabase()
+    # Reuse the caller's database so every search runs on the same open connection
+    if db is None:
+        db = CandidateDatabase()
     
     # Test search by skills
     print(f"\n🔍 Searching for Python + Machine Learning candidates:")
@@ -370,7 +527,7 @@ if __name__ == "__main__":
     db = setup_database()
     
     # Test search functionality
-    test_database_search()
+    test_database_search(db)
     
     print(f"\n🎉 Database ready for use!")
     print(f"You can now run your sourcing workflow with database channel enabled.")
\ No newline at end of file
@@ -3,6 +3,35 @@ import json
 from typing import Dict, Any, List
 import logging
 
+try:
+    import orjson
+    
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Years-of-experience range for each experience level
+_LEVEL_MAP = {
+    "entry": (0, 2),
+    "junior": (1, 3),
+    "mid": (3, 7),
+    "senior": (5, 12),
+    "lead": (7, 15),
+    "principal": (10, 20),
+    "staff": (8, 20)
+}
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    """Open a connection with WAL journaling and tuned cache settings"""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.row_factory = sqlite3.Row
+    return conn
+
 def debug_database_candidates(db_path: str = "candidates.db"):
     """Debug function to identify why candidates query returns empty results"""
     
@@ -10,7 +39,7 @@ def debug_database_candidates(db_path: str = "candidates.db"):
     print("=" * 60)
     
     try:
-        conn = sqlite3.connect(db_path)
+        conn = _connect(db_path)
         cursor = conn.cursor()
         
         # 1. Check if table exists
@@ -59,17 +88,16 @@ def debug_database_candidates(db_path: str = "candidates.db"):
         
         print(f"📋 Table columns: {columns}")
         
-        for i, row in enumerate(rows):
-            candidate = dict(zip(columns, row))
+        for i, candidate in enumerate(rows):
             print(f"\n👤 Sample Candidate {i+1}:")
-            print(f"   ID: {candidate.get('id')} (type: {type(candidate.get('id'))})")
-            print(f"   Source ID: {candidate.get('source_id')} (type: {type(candidate.get('source_id'))})")
-            print(f"   Name: {candidate.get('name')}")
-            print(f"   Email: {candidate.get('email')}")
-            print(f"   Status: {candidate.get('status')}")
-            print(f"   Skills: {candidate.get('skills')} (type: {type(candidate.get('skills'))})")
-            print(f"   Location: {candidate.get('location')}")
-            print(f"   Experience: {candidate.get('experience_years')}")
+            print(f"   ID: {candidate['id']} (type: {type(candidate['id'])})")
+            print(f"   Source ID: {candidate['source_id']} (type: {type(candidate['source_id'])})")
+            print(f"   Name: {candidate['name']}")
+            print(f"   Email: {candidate['email']}")
+            print(f"   Status: {candidate['status']}")
+            print(f"   Skills: {candidate['skills']} (type: {type(candidate['skills'])})")
+            print(f"   Location: {candidate['location']}")
+            print(f"   Experience: {candidate['experience_years']}")
         
         # 5. Test specific job requirements that might be failing
         print("\n5️⃣ Testing job requirement filters...")
@@ -95,17 +123,11 @@ def debug_database_candidates(db_path: str = "candidates.db"):
         print("\n   B. Testing skills filter...")
         required_skills = test_job_requirements.get('required_skills', [])
         if required_skills:
-            skill_conditions = []
-            params = []
-            for skill in required_skills:
-                skill_conditions.append("skills LIKE ?")
-                params.append(f"%{skill}%")
-            
             skills_query = f"""
                 SELECT COUNT(*) FROM candidates 
-                WHERE status = 'available' AND ({' OR '.join(skill_conditions)})
+                WHERE status = 'available' AND {skills_clause(len(required_skills))}
             """
-            cursor.execute(skills_query, params)
+            cursor.execute(skills_query, skill_patterns(required_skills))
             skills_count = cursor.fetchone()[0]
             print(f"      Skills filter result: {skills_count} candidates")
             
@@ -116,7 +138,7 @@ def debug_database_candidates(db_path: str = "candidates.db"):
             for (skills_json,) in sample_skills:
                 try:
                     if skills_json:
-                        skills = json.loads(skills_json)
+                        skills = _json_loads(skills_json)
                         print(f"         {skills}")
                 except:
                     print(f"         Raw: {skills_json}")
@@ -175,11 +197,8 @@ def debug_database_candidates(db_path: str = "candidates.db"):
         # Add skills filter
         required_skills = test_job_requirements.get('required_skills', [])
         if required_skills:
-            skill_conditions = []
-            for skill in required_skills:
-                skill_conditions.append("skills LIKE ?")
-                params.append(f"%{skill}%")
-            where_clauses.append(f"({' OR '.join(skill_conditions)})")
+            where_clauses.append(skills_clause(len(required_skills)))
+            params.extend(skill_patterns(required_skills))
         
         # Add location filter (only if not remote-friendly)
         location = test_job_requirements.get('location', '')
@@ -213,11 +232,11 @@ def debug_database_candidates(db_path: str = "candidates.db"):
             
             # Try with just status and one skill
             if required_skills:
-                relaxed_query = """
+                relaxed_query = f"""
                     SELECT COUNT(*) FROM candidates 
-                    WHERE status = 'available' AND skills LIKE ?
+                    WHERE status = 'available' AND {skills_clause(1)}
                 """
-                cursor.execute(relaxed_query, (f"%{required_skills[0]}%",))
+                cursor.execute(relaxed_query, skill_patterns(required_skills[:1]))
                 relaxed_count = cursor.fetchone()[0]
                 print(f"      Relaxed filter (just {required_skills[0]}): {relaxed_count} candidates")
         
@@ -231,18 +250,19 @@ def debug_database_candidates(db_path: str = "candidates.db"):
         logging.error(f"Database debug error: {e}", exc_info=True)
         return False
 
+def skills_clause(skill_count: int) -> str:
+    """SQL condition matching candidates whose JSON skills contain any of skill_count LIKE patterns"""
+    skill_conditions = ' OR '.join(['je.value LIKE ?'] * skill_count)
+    return ("EXISTS (SELECT 1 FROM json_each(CASE WHEN json_valid(skills) THEN skills ELSE '[]' END) je "
+            f"WHERE {skill_conditions})")
+
+def skill_patterns(skills: List[str]) -> List[str]:
+    """LIKE patterns for skills_clause, matching each skill as a substring"""
+    return [f"%{skill}%" for skill in skills]
+
 def get_experience_range(experience_level: str) -> tuple:
     """Convert experience level to years range"""
-    level_map = {
-        "entry": (0, 2),
-        "junior": (1, 3),
-        "mid": (3, 7),
-        "senior": (5, 12),
-        "lead": (7, 15),
-        "principal": (10, 20),
-        "staff": (8, 20)
-    }
-    return level_map.get(experience_level.lower(), None)
+    return _LEVEL_MAP.get(experience_level.lower() if experience_level else '')
 
 def fix_candidate_status_if_needed(db_path: str = "candidates.db"):
     """Fix candidate status if they're not set to 'available'"""
@@ -250,7 +270,7 @@ def fix_candidate_status_if_needed(db_path: str = "candidates.db"):
     print("\n🔧 FIXING CANDIDATE STATUS...")
     
     try:
-        conn = sqlite3.connect(db_path)
+        conn = _connect(db_path)
         cursor = conn.cursor()
         
         # Check current status distribution
@@ -1,3 +1,5 @@
+import argparse
+import asyncio
 import traceback
 import sys
 import os
@@ -10,14 +12,16 @@ load_dotenv()
 # Import existing components
 from utils import convert_database_candidate
 from database.database_integration import CandidateDatabase, test_database_connection
-from workflows.screening import create_database_screening_workflow, create_database_screening_state
+from workflows.screening import (
+    create_database_screening_workflow, create_database_screening_state, apply_shortlist_threshold
+)
 from models.screening import ScreeningCriteria
 
 # Import REAL email outreach components
-from agents.outreach import OutreachAgent
+from agents.outreach import OutreachAgent, ASYNC_SMTP_AVAILABLE
 from models.outreach import EmailProvider, OutreachState
 
-def run_real_email_pipeline():
+def run_real_email_pipeline(skip_self_test: bool = False):
     """Run complete recruitment pipeline with REAL email sending"""
     
     print("🚀 REAL EMAIL RECRUITMENT PIPELINE")
@@ -56,9 +60,14 @@ def run_real_email_pipeline():
         return None
     
     try:
-        # Step 1: Database Connection Test
-        print(f"\n🔌 Testing Database Connection...")
-        if not test_database_connection():
+        # Step 1: Database Connection Test (skipped on request; the schema check always runs)
+        if skip_self_test:
+            database_ready = CandidateDatabase.get_default().ensure_database_exists()
+        else:
+            print(f"\n🔌 Testing Database Connection...")
+            database_ready = test_database_connection()
+        
+        if not database_ready:
             print("❌ Database connection failed")
             return None
         
@@ -103,32 +112,35 @@ while collaborating with world-class engineers and researchers.
         print("🔍 STAGE 1-3: CANDIDATE SCREENING")
         print(f"{'='*60}")
         
-        # Get and convert candidates
-        db = CandidateDatabase()
-        raw_candidates = db.get_candidates_for_job(job_requirements, max_candidates=20)
-        
-        if not raw_candidates:
-            raw_candidates = db.get_all_candidates(max_candidates=10)
-        
-        print(f"🔧 Converting {len(raw_candidates)} candidates...")
+        # Stream and convert candidates as rows are fetched; the query itself falls back
+        # to any available candidate when none match the requirements
         converted_candidates = []
+        conversion_errors = []
         
-        for candidate in raw_candidates:
+        for candidate in CandidateDatabase.get_default().iter_candidates_for_job(job_requirements, max_candidates=20):
             try:
                 converted = convert_database_candidate(candidate)
                 converted_candidates.append(converted)
             except Exception as e:
-                print(f"   ⚠️ Conversion error: {e}")
+                conversion_errors.append(f"{candidate.get('name', 'Unknown')}: {e}")
+        
+        # One summary line instead of per-row output; details only when VERBOSE is set
+        total_fetched = len(converted_candidates) + len(conversion_errors)
+        print(f"🔧 Converted {len(converted_candidates)}/{total_fetched} candidates ({len(conversion_errors)} failed)")
+        if conversion_errors and os.getenv('VERBOSE'):
+            for error in conversion_errors:
+                print(f"   ⚠️ Conversion error: {error}")
         
         # Run screening
+        criteria_dict = screening_criteria.model_dump()
         screening_state = create_database_screening_state(
             job_requirements=job_requirements,
-            screening_criteria=screening_criteria.model_dump(),
+            screening_criteria=criteria_dict,
             max_candidates=50
         )
         
+        # The workflow screens these instead of querying the database again
         screening_state["raw_candidates"] = converted_candidates
-        screening_state["total_candidates"] = len(converted_candidates)
         
         screening_workflow = create_database_screening_workflow()
         screening_result = screening_workflow.invoke(screening_state)
@@ -145,8 +157,8 @@ while collaborating with world-class engineers and researchers.
         if shortlisted_count == 0:
             print("⚠️ No candidates shortlisted. Lowering threshold...")
             screening_criteria.shortlist_threshold = 60.0
-            screening_state["screening_criteria"] = screening_criteria.model_dump()
-            screening_result = screening_workflow.invoke(screening_state)
+            # Scores don't change with the threshold, so re-filter the existing results instead of screening again
+            screening_result = apply_shortlist_threshold(screening_result, screening_criteria.shortlist_threshold)
             shortlisted_count = len(screening_result["shortlisted_candidates"])
             print(f"   🔄 New shortlist: {shortlisted_count}")
         
@@ -237,11 +249,14 @@ while collaborating with world-class engineers and researchers.
             return None
         
         print(f"\n🚀 Sending {len(emails_to_send)} REAL emails...")
-        print(f"⏱️ Stagger time: 30 seconds between emails")
+        print(f"⏱️ Stagger time: 30 seconds between emails on each of {agent.email_provider.concurrency} connections")
         
         # Send emails with proper staggering
         start_time = datetime.now()
-        results = agent.send_batch_emails(emails_to_send, stagger_seconds=30)
+        if ASYNC_SMTP_AVAILABLE:
+            results = asyncio.run(agent.send_batch_emails_async(emails_to_send, stagger_seconds=30))
+        else:
+            results = agent.send_batch_emails(emails_to_send, stagger_seconds=30)
         end_time = datetime.now()
         
         # Step 8: Display Results
@@ -370,6 +385,11 @@ def run_quick_real_email_test():
         return False
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recruitment pipeline with real email outreach")
+    parser.add_argument("--skip-tests", action="store_true",
+                        help="skip the database self-test before running the pipeline")
+    args = parser.parse_args()
+    
     print("📧 REAL EMAIL RECRUITMENT PIPELINE")
     print("=" * 60)
     
@@ -384,7 +404,7 @@ if __name__ == "__main__":
     
     if mode == "1":
         print(f"\n🚀 Running full pipeline with REAL email sending...")
-        result = run_real_email_pipeline()
+        result = run_real_email_pipeline(skip_self_test=args.skip_tests)
         
         if result:
             print(f"\n🎉 SUCCESS! REAL EMAIL PIPELINE COMPLETE!")
@@ -166,6 +166,8 @@ class EmailProvider(BaseModel):
     rate_limit: int = Field(default=100, description="Emails per hour limit")
     batch_size: int = Field(default=10, description="Emails per batch")
     retry_attempts: int = Field(default=3, description="Retry attempts for failed emails")
+    concurrency: int = Field(default=1, description="Parallel SMTP connections per batch; each connection is staggered separately")
+    max_messages_per_connection: int = Field(default=100, description="Emails sent before an SMTP connection is recycled")
     
     # Tracking settings
     track_opens: bool = Field(default=True)
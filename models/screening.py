@@ -28,6 +28,12 @@ class ScreeningCriteria(BaseModel):
     # Scoring thresholds
     pass_threshold: float = Field(default=60.0, description="Minimum score to pass screening")
     shortlist_threshold: float = Field(default=75.0, description="Minimum score for shortlisting")
+    
+    @property
+    def total_weight(self) -> float:
+        """Sum of all component weights"""
+        return (self.required_skills_weight + self.preferred_skills_weight + self.experience_weight +
+                self.location_weight + self.education_weight)
 
 class SkillMatch(BaseModel):
     """Skill matching result"""
@@ -175,7 +175,7 @@ def send_outreach_emails(state: OutreachState) -> OutreachState:
     ]
 
     print(f"📊 Sending {len(emails_to_send)} emails...")
-    print(f"⏱️ Stagger time: {stagger_seconds} seconds between emails")
+    print(f"⏱️ Stagger time: {stagger_seconds} seconds between emails on each of {agent.email_provider.concurrency} connections")
 
     # Send emails in batch
     batch_results = agent.send_batch_emails(emails_to_send, stagger_seconds)
@@ -1,5 +1,7 @@
+import heapq
 import time
 from datetime import datetime
+from operator import itemgetter
 from typing import Dict, List, Any
 from models.screening import ScreeningState, ScreeningCriteria, ScreeningSummary
 from agents.screening import ScreeningAgent
@@ -59,7 +61,7 @@ def screen_candidates_batch(state: ScreeningState) -> ScreeningState:
     print(f"🔍 Starting batch screening of candidates...")
     
     # Initialize screening agent
-    agent = ScreeningAgent()
+    agent = ScreeningAgent.get_default()
     
     # Parse screening criteria
     criteria_dict = state["screening_criteria"]
@@ -79,12 +81,12 @@ def screen_candidates_batch(state: ScreeningState) -> ScreeningState:
     
     total_candidates = len(state["raw_candidates"])
     
-    for i, candidate_data in enumerate(state["raw_candidates"]):
+    # Screen the whole batch (in parallel for large batches)
+    results = agent.screen_candidates_batch(state["raw_candidates"], job_requirements, criteria)
+    
+    for i, (candidate_data, result) in enumerate(zip(state["raw_candidates"], results)):
         try:
-            print(f"  📝 Screening candidate {i+1}/{total_candidates}: {candidate_data.get('name', 'Unknown')}")
-            
-            # Screen the candidate
-            result = agent.screen_candidate(candidate_data, job_requirements, criteria)
+            print(f"  📝 Screened candidate {i+1}/{total_candidates}: {candidate_data.get('name', 'Unknown')}")
             
             # Convert result to dict for state storage
             result_dict = result.model_dump()
@@ -157,6 +159,15 @@ def check_screening_completion(state: ScreeningState) -> str:
     else:
         return "continue_screening"
 
+def _index_candidates(candidates: List[Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+    """Map each candidate's source_id and id to the first candidate carrying it"""
+    candidates_by_id = {}
+    for candidate_data in candidates:
+        for key in (candidate_data.get("source_id"), candidate_data.get("id")):
+            if key is not None:
+                candidates_by_id.setdefault(key, candidate_data)
+    return candidates_by_id
+
 def finalize_screening(state: ScreeningState) -> ScreeningState:
     """Finalize screening and generate detailed report"""
     
@@ -181,24 +192,16 @@ def finalize_screening(state: ScreeningState) -> ScreeningState:
     if state["shortlisted_candidates"]:
         print(f"\n🌟 Top Shortlisted Candidates:")
         
-        # Sort by score
-        results_with_scores = []
-        for i, result_dict in enumerate(state["screening_results"]):
-            if result_dict["recommended_for_shortlist"]:
-                candidate = None
-                for candidate_data in state["raw_candidates"]:
-                    if candidate_data.get("source_id") == result_dict["candidate_id"] or \
-                       candidate_data.get("id") == result_dict["candidate_id"]:
-                        candidate = candidate_data
-                        break
-                
-                if candidate:
-                    results_with_scores.append((result_dict, candidate))
-        
-        # Sort by weighted score
-        results_with_scores.sort(key=lambda x: x[0]["weighted_score"], reverse=True)
+        # Filter the shortlist and pick the top five in a single pass over the results
+        candidates_by_id = _index_candidates(state["raw_candidates"])
+        shortlisted_results = (
+            result_dict for result_dict in state["screening_results"]
+            if result_dict["recommended_for_shortlist"] and candidates_by_id.get(result_dict["candidate_id"])
+        )
+        top_results = heapq.nlargest(5, shortlisted_results, key=itemgetter("weighted_score"))
         
-        for i, (result, candidate) in enumerate(results_with_scores[:5]):
+        for i, result in enumerate(top_results):
+            candidate = candidates_by_id[result["candidate_id"]]
             name = candidate.get('name', 'Unknown')
             title = candidate.get('current_title', 'N/A')
             score = result['weighted_score']
@@ -242,15 +245,11 @@ def generate_screening_report(state: ScreeningState) -> Dict[str, Any]:
     summary = metrics.get('summary', {})
     
     # Detailed candidate analysis
+    candidates_by_id = _index_candidates(state["raw_candidates"])
     candidate_details = []
     for result_dict in state["screening_results"]:
         # Find corresponding candidate data
-        candidate = None
-        for candidate_data in state["raw_candidates"]:
-            if candidate_data.get("source_id") == result_dict["candidate_id"] or \
-               candidate_data.get("id") == result_dict["candidate_id"]:
-                candidate = candidate_data
-                break
+        candidate = candidates_by_id.get(result_dict["candidate_id"])
         
         if candidate:
             candidate_details.append({
@@ -260,8 +259,9 @@ def generate_screening_report(state: ScreeningState) -> Dict[str, Any]:
                            "Passed" if result_dict["passes_screening"] else "Rejected"
             })
     
-    # Sort by score
-    candidate_details.sort(key=lambda x: x["screening_result"]["weighted_score"], reverse=True)
+    # Only the ten best-scoring candidates are reported
+    top_candidates = heapq.nlargest(10, candidate_details,
+                                    key=lambda x: x["screening_result"]["weighted_score"])
     
     report = {
         "stage": "Initial Screening",
@@ -276,7 +276,7 @@ def generate_screening_report(state: ScreeningState) -> Dict[str, Any]:
             "average_score": f"{metrics['average_score']:.1f}",
             "processing_time": f"{metrics['processing_time_seconds']:.2f} seconds"
         },
-        "top_candidates": candidate_details[:10],  # Top 10 candidates
+        "top_candidates": top_candidates,
         "analysis": {
             "most_common_missing_skills": summary.get('most_common_missing_skills', []),
             "experience_distribution": summary.get('experience_distribution', {}),
@@ -5,15 +5,38 @@ from langchain_core.tools import StructuredTool
 import logging
 from datetime import datetime
 import os
+import threading
 
 class CandidateDatabase:
     """Database connection manager for candidate retrieval"""
     
     def __init__(self, db_path: str = "candidates.db"):
         self.db_path = db_path
+        self._tls = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
         if not os.path.exists(db_path):
             logging.warning(f"Database file {db_path} not found. Please run database setup first.")
     
+    def _conn(self) -> sqlite3.Connection:
+        """Connection owned by the calling thread, opened on first use and kept for later searches"""
+        conn = getattr(self._tls, "conn", None)
+        if conn is None:
+            # Used only by its owning thread; close() may run elsewhere
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._tls.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    def close(self):
+        """Close every thread's connection"""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._tls = threading.local()
+    
     def search_candidates(self, skills: List[str] = None, location: str = None, 
                          experience_level: str = None, max_results: int = 50) -> List[Dict[str, Any]]:
         """Search candidates based on criteria"""
@@ -22,8 +45,7 @@ class CandidateDatabase:
             return []
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self._conn().cursor()
             
             # Build dynamic query
             where_clauses = ["status = 'available'"]
@@ -93,7 +115,6 @@ class CandidateDatabase:
                 }
                 candidates.append(formatted_candidate)
             
-            conn.close()
             return candidates
             
         except Exception as e:
@@ -123,10 +144,12 @@ def create_database_tool() -> StructuredTool:
         experience_level: str = Field(description="Experience level required")
         max_results: int = Field(default=50, description="Maximum number of results")
     
+    # One database per tool, so repeated searches reuse their thread's open connection
+    db = CandidateDatabase()
+    
     def database_search(skills: List[str], location: str, experience_level: str, max_results: int = 50) -> List[Dict[str, Any]]:
         """Search internal database for candidates"""
         try:
-            db = CandidateDatabase()
             candidates = db.search_candidates(
                 skills=skills,
                 location=location,
@@ -2,8 +2,8 @@ from typing import TypedDict, List, Dict, Any, Optional
 from models.screening import CandidateProfile
 from models.sourcing import SourceChannel, SourcingState
 
-def create_candidate_from_raw_data(raw_data: Dict[str, Any], source: SourceChannel) -> CandidateProfile:
-    """Create a CandidateProfile from raw source data with proper type conversion"""
+def _map_raw_candidate_fields(raw_data: Dict[str, Any], source: SourceChannel) -> Dict[str, Any]:
+    """Map raw source data onto CandidateProfile field names"""
     
     # Extract common fields with type conversion
     candidate_data = {
@@ -54,7 +54,15 @@ def create_candidate_from_raw_data(raw_data: Dict[str, Any], source: SourceChann
     if "source_id" in candidate_data:
         candidate_data["source_id"] = str(candidate_data["source_id"])
     
-    return CandidateProfile(**candidate_data)
+    return candidate_data
+
+def create_candidate_from_raw_data(raw_data: Dict[str, Any], source: SourceChannel) -> CandidateProfile:
+    """Create a CandidateProfile from raw source data with proper type conversion"""
+    return CandidateProfile(**_map_raw_candidate_fields(raw_data, source))
+
+def candidate_dict_from_raw_data(raw_data: Dict[str, Any], source: SourceChannel) -> Dict[str, Any]:
+    """Build a validated CandidateProfile dict for raw source data"""
+    return create_candidate_from_raw_data(raw_data, source).model_dump()
 
 def validate_candidate_completeness(candidate: CandidateProfile) -> Dict[str, Any]:
     """Validate how complete a candidate profile is"""
@@ -1,10 +1,11 @@
 from langgraph.graph import StateGraph, START, END
 from models.screening import ScreeningState, ScreeningCriteria
-from nodes.screening import finalize_screening, check_screening_completion
+from nodes.screening import finalize_screening, check_screening_completion, _index_candidates
 from database.database_integration import CandidateDatabase
 from agents.screening import ScreeningAgent
 from models.screening import ScreeningResult
 from utils import safe_add_message
+import sys
 import time
 import logging
 
@@ -27,14 +28,7 @@ def initialize_database_screening(state: ScreeningState) -> ScreeningState:
     if "messages" not in state:
         state["messages"] = []
     
-    # Initialize database connection
     try:
-        db = CandidateDatabase()
-        
-        # Get database statistics
-        stats = db.get_database_stats()
-        print(f"📊 Database contains {stats.get('available_candidates', 0)} available candidates")
-        
         # Retrieve candidates based on job requirements
         job_requirements = state["job_requirements"]
         max_candidates = state.get("max_candidates", 50)
@@ -45,13 +39,21 @@ def initialize_database_screening(state: ScreeningState) -> ScreeningState:
         print(f"   Location: {job_requirements.get('location', 'N/A')}")
         print(f"   Experience Level: {job_requirements.get('experience_level', 'N/A')}")
         
-        # Get candidates from database
-        candidates = db.get_candidates_for_job(job_requirements, max_candidates)
-        
-        if not candidates:
-            print("⚠️ No candidates found matching job requirements")
-            print("🔄 Trying to get all available candidates...")
-            candidates = db.get_all_candidates(max_candidates=20)
+        candidates = state.get("raw_candidates")
+        if candidates:
+            # The caller already loaded (and converted) candidates; don't query again
+            print(f"📦 Using {len(candidates)} candidates already loaded into the screening state")
+        else:
+            # Initialize database connection
+            db = CandidateDatabase.get_default()
+            
+            # Get database statistics
+            stats = db.get_database_stats()
+            print(f"📊 Database contains {stats.get('available_candidates', 0)} available candidates")
+            
+            # Get candidates from database; the query relaxes its own filters, falling back
+            # to any available candidate, when nothing matches the job requirements
+            candidates = db.get_candidates_for_job(job_requirements, max_candidates)
         
         # Update state with database candidates
         state["raw_candidates"] = candidates
@@ -91,13 +93,17 @@ def initialize_database_screening(state: ScreeningState) -> ScreeningState:
         
         return state
 
+def _screening_status(passes: bool, shortlisted: bool) -> str:
+    """Database status recorded for a screening decision"""
+    return "shortlisted" if shortlisted else "screened_pass" if passes else "screened_fail"
+
 def screen_database_candidates(state: ScreeningState) -> ScreeningState:
     """Screen candidates retrieved from database"""
     
     print(f"🔍 Starting database candidate screening...")
     
     # Initialize screening agent
-    agent = ScreeningAgent()
+    agent = ScreeningAgent.get_default()
     
     # Parse screening criteria
     criteria_dict = state["screening_criteria"]
@@ -114,6 +120,7 @@ def screen_database_candidates(state: ScreeningState) -> ScreeningState:
     passed_candidates = []
     shortlisted_candidates = []
     processing_errors = []
+    status_updates = []
     
     total_candidates = len(state["raw_candidates"])
     
@@ -123,28 +130,31 @@ def screen_database_candidates(state: ScreeningState) -> ScreeningState:
     print(f"   Min experience: {criteria.min_experience_years} years")
     print(f"   Allow remote: {criteria.allow_remote}")
     
-    for i, candidate_data in enumerate(state["raw_candidates"]):
+    # Screen the whole batch (in parallel for large batches)
+    results = agent.screen_candidates_batch(state["raw_candidates"], job_requirements, criteria)
+    
+    # Per-candidate lines are buffered and written in one call once the loop is done
+    report = []
+    
+    for i, (candidate_data, result) in enumerate(zip(state["raw_candidates"], results)):
         try:
             candidate_name = candidate_data.get('name', 'Unknown')
             candidate_title = candidate_data.get('current_title', 'N/A')
             candidate_exp = candidate_data.get('experience_years', 0)
             
-            print(f"  📝 [{i+1}/{total_candidates}] {candidate_name}")
-            print(f"      Title: {candidate_title}")
-            print(f"      Experience: {candidate_exp} years")
-            print(f"      Skills: {', '.join(candidate_data.get('skills', [])[:3])}...")
-            
-            # Screen the candidate
-            result = agent.screen_candidate(candidate_data, job_requirements, criteria)
+            report.append(f"  📝 [{i+1}/{total_candidates}] {candidate_name}")
+            report.append(f"      Title: {candidate_title}")
+            report.append(f"      Experience: {candidate_exp} years")
+            report.append(f"      Skills: {', '.join(candidate_data.get('skills', [])[:3])}...")
             
             # Convert result to dict for state storage
             result_dict = result.model_dump()
             screening_results.append(result_dict)
             
             # Show result
-            print(f"      📊 Score: {result.weighted_score:.1f} | {'✅ PASS' if result.passes_screening else '❌ FAIL'}")
+            report.append(f"      📊 Score: {result.weighted_score:.1f} | {'✅ PASS' if result.passes_screening else '❌ FAIL'}")
             if result.recommended_for_shortlist:
-                print(f"      🌟 SHORTLISTED")
+                report.append(f"      🌟 SHORTLISTED")
             
             # Categorize candidates
             if result.passes_screening:
@@ -153,28 +163,31 @@ def screen_database_candidates(state: ScreeningState) -> ScreeningState:
                 if result.recommended_for_shortlist:
                     shortlisted_candidates.append(candidate_data)
             
-            # Update candidate status in database if needed
-            try:
-                db = CandidateDatabase()
-                status = "shortlisted" if result.recommended_for_shortlist else \
-                        "screened_pass" if result.passes_screening else \
-                        "screened_fail"
-                
-                notes = f"Score: {result.weighted_score:.1f}, Strengths: {', '.join(result.strengths[:2])}"
-                db.update_candidate_status(candidate_data['source_id'], status, notes)
-            except Exception as db_error:
-                print(f"      ⚠️ Failed to update database status: {db_error}")
+            # Queue candidate status update for the database
+            status = _screening_status(result.passes_screening, result.recommended_for_shortlist)
+            
+            notes = f"Score: {result.weighted_score:.1f}, Strengths: {', '.join(result.strengths[:2])}"
+            status_updates.append((candidate_data['source_id'], status, notes))
             
             # Update progress
             state["current_candidate_index"] = i + 1
             
-            print()  # Add spacing between candidates
+            report.append("")  # Add spacing between candidates
             
         except Exception as e:
             error_msg = f"Error screening candidate {i+1} ({candidate_data.get('name', 'Unknown')}): {str(e)}"
             processing_errors.append(error_msg)
             logging.error(f"Screening error: {e}", exc_info=True)
-            print(f"    ❌ {error_msg}")
+            report.append(f"    ❌ {error_msg}")
+    
+    if report:
+        sys.stdout.write("\n".join(report) + "\n")
+    
+    # Write all candidate statuses back in one batch
+    try:
+        CandidateDatabase.get_default().update_candidate_statuses(status_updates)
+    except Exception as db_error:
+        print(f"⚠️ Failed to update database status: {db_error}")
     
     # Calculate processing time
     processing_time = time.time() - start_time
@@ -224,6 +237,61 @@ def screen_database_candidates(state: ScreeningState) -> ScreeningState:
     
     return state
 
+def apply_shortlist_threshold(state: ScreeningState, shortlist_threshold: float) -> ScreeningState:
+    """Re-decide already screened candidates against a new shortlist threshold without scoring them again"""
+    
+    agent = ScreeningAgent.get_default()
+    criteria_dict = {**state["screening_criteria"], "shortlist_threshold": shortlist_threshold}
+    criteria = ScreeningCriteria(**criteria_dict)
+    candidates_by_id = _index_candidates(state["raw_candidates"])
+    
+    passed_candidates = []
+    shortlisted_candidates = []
+    status_updates = []
+    
+    # Scores don't depend on the thresholds, so only the decisions are made again
+    for result_dict in state["screening_results"]:
+        passes, shortlisted = agent._make_decisions(result_dict, criteria)
+        
+        if (passes, shortlisted) != (result_dict["passes_screening"], result_dict["recommended_for_shortlist"]):
+            result_dict["passes_screening"] = passes
+            result_dict["recommended_for_shortlist"] = shortlisted
+            notes = f"Score: {result_dict['weighted_score']:.1f}, Strengths: {', '.join(result_dict['strengths'][:2])}"
+            status_updates.append((result_dict["candidate_id"], _screening_status(passes, shortlisted), notes))
+        
+        candidate_data = candidates_by_id.get(result_dict["candidate_id"])
+        if passes and candidate_data:
+            passed_candidates.append(candidate_data)
+            
+            if shortlisted:
+                shortlisted_candidates.append(candidate_data)
+    
+    if status_updates:
+        try:
+            CandidateDatabase.get_default().update_candidate_statuses(status_updates)
+        except Exception as db_error:
+            print(f"⚠️ Failed to update database status: {db_error}")
+    
+    metrics = state["screening_metrics"]
+    summary = agent.generate_screening_summary(
+        [ScreeningResult(**result) for result in state["screening_results"]],
+        metrics["processing_time_seconds"]
+    )
+    
+    state["screening_criteria"] = criteria_dict
+    state["passed_candidates"] = passed_candidates
+    state["shortlisted_candidates"] = shortlisted_candidates
+    state["screening_metrics"] = {
+        **metrics,
+        "passed_count": len(passed_candidates),
+        "shortlisted_count": len(shortlisted_candidates),
+        "rejected_count": metrics["total_processed"] - len(passed_candidates),
+        "average_score": summary.average_score,
+        "summary": summary.model_dump()
+    }
+    
+    return state
+
 def create_database_screening_workflow() -> StateGraph:
     """Create screening workflow that integrates with candidate database"""
     